@@ -0,0 +1,86 @@
+"""
+Sign/verify throughput of every JWT engine and algorithm on freshly generated keys.
+
+    python benchmarks/jwt_signing.py --seconds 2
+"""
+
+import argparse
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from services.jwt_engines import ENGINES  # noqa: E402
+from services.keys import load_key_ring  # noqa: E402
+from settings import TokenSettings  # noqa: E402
+
+
+def generate_keys() -> dict[str, str]:
+    private_keys = {
+        "RS256": rsa.generate_private_key(public_exponent=65537, key_size=2048),
+        "ES256": ec.generate_private_key(ec.SECP256R1()),
+        "EdDSA": ed25519.Ed25519PrivateKey.generate(),
+    }
+    keys = {
+        algorithm: key.private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+        ).decode()
+        for algorithm, key in private_keys.items()
+    }
+    keys["HS256"] = uuid.uuid4().hex
+    return keys
+
+
+def ops_per_second(func: Callable[[], Any], seconds: float) -> float:
+    operations = 0
+    started = time.perf_counter()
+    deadline = started + seconds
+    while time.perf_counter() < deadline:
+        for _ in range(50):
+            func()
+        operations += 50
+    return operations / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=1.0, help="time spent on each measurement")
+    args = parser.parse_args()
+
+    issued_at = datetime.now(timezone.utc)
+    # same shape as an access token issued by AuthService.login
+    claims = {
+        "jti": str(uuid.uuid4()),
+        "iat": issued_at.timestamp(),
+        "exp": issued_at + timedelta(minutes=15),
+        "sub": str(uuid.uuid4()),
+        "refresh_jti": str(uuid.uuid4()),
+        "is_active": True,
+        "is_verified": False,
+        "is_superuser": False,
+        "role": "guest",
+    }
+
+    print(f"{'engine':<14}{'algorithm':<11}{'sign/s':>10}{'verify/s':>12}{'token bytes':>13}")
+    for algorithm, secret_key in generate_keys().items():
+        for engine_name, engine in ENGINES.items():
+            if algorithm not in engine.algorithms:
+                continue
+            key_ring = load_key_ring(
+                TokenSettings(secret_key=secret_key, public_key=None, algorithm=algorithm, jwt_engine=engine_name)
+            )
+            token = key_ring.encode(dict(claims))
+            sign = ops_per_second(lambda ring=key_ring: ring.encode(dict(claims)), args.seconds)
+            verify = ops_per_second(lambda ring=key_ring, token=token: ring.decode(token), args.seconds)
+            print(f"{engine_name:<14}{algorithm:<11}{sign:>10.0f}{verify:>12.0f}{len(token):>13}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import fakeredis.aioredis
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+SRC_DIR = Path(__file__).resolve().parents[2] / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+if "SECRET_KEY" not in os.environ and not (SRC_DIR.parent / ".env").exists():
+    # keys must be RSA 4096 as in .env.example, so numbers stay comparable with the baseline
+    os.environ["SECRET_KEY"] = (
+        rsa.generate_private_key(public_exponent=65537, key_size=4096)
+        .private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption())
+        .decode()
+    )
+
+from repositories.refresh_tokens.redis_revoked_refresh_token import RedisRevokedRefreshTokenRepository  # noqa: E402
+from repositories.refresh_tokens.redis_tokens_epoch import RedisTokensEpochRepository  # noqa: E402
+from repositories.refresh_tokens.revocation_cache import RevocationCache  # noqa: E402
+from services.access_tokens import AccessTokenService  # noqa: E402
+from services.keys import get_key_ring  # noqa: E402
+from services.token_cache import VerifiedTokenCache  # noqa: E402
+from settings import settings  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def access_token_service_factory():
+    def inner(verified_cache: bool = False, revocation_cache: bool = True) -> AccessTokenService:
+        redis = fakeredis.aioredis.FakeRedis()
+        cache = None
+        if revocation_cache:
+            cache = RevocationCache(redis)
+            cache.ready = True
+        return AccessTokenService(
+            key_ring=get_key_ring(),
+            expires_delta_minutes=settings.token.access_token_expire_minutes,
+            revoked_refresh_repo=RedisRevokedRefreshTokenRepository(client=redis, cache=cache),
+            tokens_epoch_repo=RedisTokensEpochRepository(client=redis, cache=cache),
+            verified_cache=VerifiedTokenCache(maxsize=100) if verified_cache else None,
+        )
+
+    return inner
+
+
+@pytest.fixture
+def access_token_service(access_token_service_factory) -> AccessTokenService:
+    return access_token_service_factory()
+
+
+@pytest.fixture
+def access_token(loop, access_token_service) -> str:
+    return loop.run_until_complete(
+        access_token_service.generate_token(
+            "1f6c9e5e-5b3c-4d55-9f0e-8d7c1b2a3f40",
+            "b5a1c3d2-9e8f-4a7b-8c6d-5e4f3a2b1c0d",
+            is_active=True,
+            is_verified=False,
+            is_superuser=False,
+            role="guest",
+        )
+    )
@@ -0,0 +1,37 @@
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from api.dependencies import permissions_required
+from entities.tokens import AccessToken
+from models.roles import Permission
+from services.permissions import BUILTIN_ROLE_PERMISSIONS, PermissionMatrix
+
+
+def test_permissions_required(benchmark, loop):
+    @permissions_required(Permission.USERS_READ)
+    async def endpoint(request):
+        return request.custom_user
+
+    request = SimpleNamespace(custom_user=object(), permissions=Permission.USERS_READ | Permission.ROLES_READ)
+    result = benchmark(lambda: loop.run_until_complete(endpoint(request=request)))
+    assert result is request.custom_user
+
+
+def test_resolve_permissions(benchmark):
+    matrix = PermissionMatrix(dict(BUILTIN_ROLE_PERMISSIONS), version=3)
+    now = datetime.now(timezone.utc)
+    token = AccessToken(
+        jti=str(uuid.uuid4()),
+        sub=str(uuid.uuid4()),
+        iat=now,
+        exp=now,
+        refresh_jti=str(uuid.uuid4()),
+        is_superuser=False,
+        is_verified=True,
+        is_active=True,
+        role="admin",
+        perm=int(Permission.all()),
+        pv=3,
+    )
+    assert benchmark(matrix.resolve, "admin", token) == Permission.all()
@@ -0,0 +1,28 @@
+import pytest
+from services.password_hasher import PasswordHasher
+from services.users import PasswordHelper
+
+# bcrypt is deliberately slow, a few rounds are enough to see a change in cost factor or executor overhead
+ROUNDS = 5
+
+
+@pytest.fixture
+def password_helper() -> PasswordHelper:
+    return PasswordHelper(PasswordHasher(executor=None, max_pending=1))
+
+
+def test_hash(benchmark, loop, password_helper):
+    hashed = benchmark.pedantic(
+        lambda: loop.run_until_complete(password_helper.hash("password")), rounds=ROUNDS, iterations=1
+    )
+    assert hashed.startswith("$2b$")
+
+
+def test_verify_and_update(benchmark, loop, password_helper):
+    hashed = loop.run_until_complete(password_helper.hash("password"))
+    verified, _ = benchmark.pedantic(
+        lambda: loop.run_until_complete(password_helper.verify_and_update("password", hashed)),
+        rounds=ROUNDS,
+        iterations=1,
+    )
+    assert verified
@@ -0,0 +1,24 @@
+import uuid
+from datetime import datetime
+
+from models.users import User
+from schemas.users import BaseUser
+
+
+def test_base_user_from_orm(benchmark):
+    users = [
+        User(
+            id=uuid.uuid4(),
+            email=f"user{i}@example.com",
+            hashed_password="",
+            is_active=True,
+            is_superuser=False,
+            is_verified=False,
+            created_at=datetime.utcnow(),
+            role="guest",
+        )
+        for i in range(100)
+    ]
+    # one page of the users list
+    result = benchmark(lambda: [BaseUser.model_validate(user) for user in users])
+    assert len(result) == 100
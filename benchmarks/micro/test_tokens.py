@@ -0,0 +1,28 @@
+def test_generate_token(benchmark, access_token_service):
+    benchmark(
+        access_token_service._generate_token,
+        {"sub": "1f6c9e5e-5b3c-4d55-9f0e-8d7c1b2a3f40", "refresh_jti": "b5a1c3d2-9e8f-4a7b-8c6d-5e4f3a2b1c0d"},
+    )
+
+
+def test_validate_token(benchmark, loop, access_token_service, access_token):
+    payload = benchmark(lambda: loop.run_until_complete(access_token_service.validate_token(access_token)))
+    assert payload.role == "guest"
+
+
+def test_validate_token_verified_cache(benchmark, loop, access_token_service_factory, access_token):
+    service = access_token_service_factory(verified_cache=True)
+    payload = benchmark(lambda: loop.run_until_complete(service.validate_token(access_token)))
+    assert payload.role == "guest"
+
+
+def test_validate_token_redis(benchmark, loop, access_token_service_factory, access_token):
+    # revocation cache not ready yet: two lookups in (fake) Redis
+    service = access_token_service_factory(revocation_cache=False)
+    payload = benchmark(lambda: loop.run_until_complete(service.validate_token(access_token)))
+    assert payload.role == "guest"
+
+
+def test_get_payload(benchmark, access_token_service, access_token):
+    payload = benchmark(access_token_service.get_payload, access_token)
+    assert payload.role == "guest"
@@ -0,0 +1,32 @@
+"""partial index on live refresh tokens per user
+
+Revision ID: 2b8f4c7e1d93
+Revises: 9d4e6b1a3f20
+Create Date: 2026-10-18 11:47:52.618402
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "2b8f4c7e1d93"
+down_revision: Union[str, None] = "9d4e6b1a3f20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_refresh_tokens_user_id_not_revoked",
+        "refresh_tokens",
+        ["user_id"],
+        unique=False,
+        postgresql_where=sa.text("NOT is_revoked"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_refresh_tokens_user_id_not_revoked", table_name="refresh_tokens")
@@ -0,0 +1,28 @@
+"""keyset pagination indexes
+
+Revision ID: 5c1f0e2a9b7d
+Revises: 87a733b2266c
+Create Date: 2026-10-18 10:12:41.532118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5c1f0e2a9b7d"
+down_revision: Union[str, None] = "87a733b2266c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_users_created_at_id", "users", ["created_at", "id"], unique=False)
+    op.create_index(
+        "ix_login_histories_user_id_created_at_id", "login_histories", ["user_id", "created_at", "id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_login_histories_user_id_created_at_id", table_name="login_histories")
+    op.drop_index("ix_users_created_at_id", table_name="users")
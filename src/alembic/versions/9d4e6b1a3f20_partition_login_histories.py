@@ -0,0 +1,102 @@
+"""partition login_histories by month
+
+Revision ID: 9d4e6b1a3f20
+Revises: 5c1f0e2a9b7d
+Create Date: 2026-10-18 11:02:17.203845
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9d4e6b1a3f20"
+down_revision: Union[str, None] = "5c1f0e2a9b7d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# partitions for the months already holding data and a few months ahead,
+# later months are created by db.partitions.maintain_login_history_partitions.
+# The default partition keeps inserts working when maintenance falls behind.
+CREATE_PARTITIONS = """
+CREATE TABLE login_histories_default PARTITION OF login_histories DEFAULT;
+DO $$
+DECLARE
+    month date := date_trunc('month', LEAST(
+        COALESCE((SELECT min(created_at) FROM login_histories_unpartitioned), now()), now()
+    ));
+BEGIN
+    WHILE month <= date_trunc('month', now()) + interval '3 months' LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF login_histories FOR VALUES FROM (%L) TO (%L)',
+            'login_histories_y' || to_char(month, 'YYYY') || 'm' || to_char(month, 'MM'),
+            month,
+            month + interval '1 month'
+        );
+        month := month + interval '1 month';
+    END LOOP;
+END $$;
+"""
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE login_histories RENAME TO login_histories_unpartitioned")
+    op.execute(
+        "ALTER TABLE login_histories_unpartitioned RENAME CONSTRAINT login_histories_pkey "
+        "TO login_histories_unpartitioned_pkey"
+    )
+    op.drop_index("ix_login_histories_user_id_created_at_id", table_name="login_histories_unpartitioned")
+    op.execute(
+        """
+        CREATE TABLE login_histories (
+            id UUID NOT NULL,
+            useragent VARCHAR(512) NOT NULL,
+            remote_addr VARCHAR(100) NOT NULL,
+            referer VARCHAR(255) NOT NULL,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            user_id UUID NOT NULL,
+            CONSTRAINT login_histories_pkey PRIMARY KEY (id, created_at),
+            CONSTRAINT login_histories_user_id_fkey FOREIGN KEY (user_id) REFERENCES users (id)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    op.create_index(
+        "ix_login_histories_user_id_created_at_id", "login_histories", ["user_id", "created_at", "id"], unique=False
+    )
+    op.execute(CREATE_PARTITIONS)
+    op.execute(
+        "INSERT INTO login_histories (id, useragent, remote_addr, referer, created_at, user_id) "
+        "SELECT id, useragent, remote_addr, referer, created_at, user_id FROM login_histories_unpartitioned"
+    )
+    op.drop_table("login_histories_unpartitioned")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE login_histories RENAME TO login_histories_partitioned")
+    op.execute(
+        "ALTER TABLE login_histories_partitioned RENAME CONSTRAINT login_histories_pkey "
+        "TO login_histories_partitioned_pkey"
+    )
+    op.drop_index("ix_login_histories_user_id_created_at_id", table_name="login_histories_partitioned")
+    op.execute(
+        """
+        CREATE TABLE login_histories (
+            id UUID NOT NULL,
+            useragent VARCHAR(512) NOT NULL,
+            remote_addr VARCHAR(100) NOT NULL,
+            referer VARCHAR(255) NOT NULL,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            user_id UUID NOT NULL,
+            CONSTRAINT login_histories_pkey PRIMARY KEY (id),
+            CONSTRAINT login_histories_user_id_fkey FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+        """
+    )
+    op.create_index(
+        "ix_login_histories_user_id_created_at_id", "login_histories", ["user_id", "created_at", "id"], unique=False
+    )
+    op.execute(
+        "INSERT INTO login_histories (id, useragent, remote_addr, referer, created_at, user_id) "
+        "SELECT id, useragent, remote_addr, referer, created_at, user_id FROM login_histories_partitioned"
+    )
+    op.drop_table("login_histories_partitioned")
@@ -0,0 +1,31 @@
+"""users updated_at
+
+Revision ID: f3b8e1c5a702
+Revises: c4d2a9e6f813
+Create Date: 2026-10-18 19:02:17.846301
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f3b8e1c5a702"
+down_revision: Union[str, None] = "c4d2a9e6f813"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("users", sa.Column("updated_at", sa.DateTime(), nullable=True))
+    # existing users count as changed when they were created
+    op.execute("UPDATE users SET updated_at = COALESCE(created_at, now() AT TIME ZONE 'utc')")
+    op.alter_column("users", "updated_at", nullable=False)
+    op.create_index("ix_users_updated_at_id", "users", ["updated_at", "id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_updated_at_id", table_name="users")
+    op.drop_column("users", "updated_at")
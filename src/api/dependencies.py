@@ -1,32 +1,50 @@
 from functools import wraps
-from typing import Annotated
+from typing import Annotated, AsyncGenerator
 
-from fastapi import Cookie, Depends, HTTPException, Query
+from fastapi import Cookie, Depends, HTTPException, Query, Request
 from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
 from db.postgres import get_session
 from db.redis_db import get_redis
+from entities.tokens import AccessToken
+from metrics import time_stage
+from models.roles import Permission
 from models.users import User
 from repositories.refresh_tokens.redis_revoked_refresh_token import RedisRevokedRefreshTokenRepository
+from repositories.refresh_tokens.redis_tokens_epoch import RedisTokensEpochRepository
+from repositories.refresh_tokens.revocation_cache import RevocationCache, get_revocation_cache
 from repositories.refresh_tokens.sqlalchemy_refresh_token import SQLAlchemyRefreshTokenRepository
 from schemas.auth_request import AuthRequest
-from schemas.users import BaseUser, PaginationParams
-from services.access_tokens import AccessTokenService
+from schemas.pagination import Cursor, PaginationParams
+from schemas.users import BaseUser, UserCredentials, UserPrincipal
+from services.access_tokens import AccessTokenService, verified_access_tokens
+from services.admission import AdmissionController, get_admission_controller
 from services.auth import AuthService
-from services.exceptions import BaseTokenServiceError, ErrorCode, UserNotExistsError
+from services.exceptions import (
+    AdmissionRejectedError,
+    BaseTokenServiceError,
+    ErrorCode,
+    RateLimitExceededError,
+    UserNotExistsError,
+)
+from services.keys import KeyRing, get_key_ring
+from services.permissions import PermissionMatrix, get_permission_matrix
+from services.rate_limits import RateLimitService, get_rate_limit_service
 from services.refresh_tokens import RefreshTokenService
 from services.users import UserManager, get_user_manager
 from settings import settings
 
 
-def roles_required(roles_list: list[str]):
+def permissions_required(required: Permission):
+    """Route guard: a bit test against the permissions `get_current_user_global` put on the request."""
+
     def decorator(function):
         @wraps(function)
         async def wrapper(*args, **kwargs):
-            user: BaseUser = kwargs.get("request").custom_user  # type: ignore
-            if not user or user.role not in roles_list:
+            request: AuthRequest = kwargs.get("request")  # type: ignore
+            if required not in getattr(request, "permissions", Permission(0)):
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                 )
@@ -37,10 +55,73 @@ def roles_required(roles_list: list[str]):
     return decorator
 
 
+async def limit_login_rate(
+    request: Request,
+    credentials: UserCredentials,
+    rate_limiter: Annotated[RateLimitService | None, Depends(get_rate_limit_service)],
+) -> None:
+    # shares the parsed body with the login route's `credentials` parameter
+    if rate_limiter is None:
+        return
+    try:
+        await rate_limiter.check_login(request.client.host if request.client else "", credentials.email)
+    except RateLimitExceededError as e:
+        raise _too_many_requests(e)
+
+
+async def limit_register_rate(
+    request: Request,
+    rate_limiter: Annotated[RateLimitService | None, Depends(get_rate_limit_service)],
+) -> None:
+    if rate_limiter is None:
+        return
+    try:
+        await rate_limiter.check_register(request.client.host if request.client else "")
+    except RateLimitExceededError as e:
+        raise _too_many_requests(e)
+
+
+def _too_many_requests(error: RateLimitExceededError) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=ErrorCode.TOO_MANY_REQUESTS,
+        headers={"Retry-After": str(error.retry_after)},
+    )
+
+
+async def admit_cpu_bound(
+    controller: Annotated[AdmissionController | None, Depends(get_admission_controller)],
+) -> AsyncGenerator[None, None]:
+    """
+    Route dependency of the bcrypt and signing heavy routes, sheds them with 503 under overload,
+    of the worker or of the password hashing pool.
+    """
+    try:
+        if controller is None:
+            yield
+        else:
+            async with controller.admit():
+                yield
+    except AdmissionRejectedError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=ErrorCode.SERVICE_OVERLOADED,
+            headers={"Retry-After": str(settings.admission.admission_retry_after)},
+        )
+
+
 def get_revoked_refresh_tokens_repo(
     redis_client: Annotated[Redis, Depends(get_redis)],
+    revocation_cache: Annotated[RevocationCache | None, Depends(get_revocation_cache)] = None,
 ) -> RedisRevokedRefreshTokenRepository:
-    return RedisRevokedRefreshTokenRepository(client=redis_client)
+    return RedisRevokedRefreshTokenRepository(client=redis_client, cache=revocation_cache)
+
+
+def get_tokens_epoch_repo(
+    redis_client: Annotated[Redis, Depends(get_redis)],
+    revocation_cache: Annotated[RevocationCache | None, Depends(get_revocation_cache)] = None,
+) -> RedisTokensEpochRepository:
+    return RedisTokensEpochRepository(client=redis_client, cache=revocation_cache)
 
 
 def get_refresh_tokens_repo(
@@ -54,26 +135,29 @@ def get_refresh_token_service(
     revoked_refresh_tokens_repo: Annotated[
         RedisRevokedRefreshTokenRepository, Depends(get_revoked_refresh_tokens_repo)
     ],
+    tokens_epoch_repo: Annotated[RedisTokensEpochRepository, Depends(get_tokens_epoch_repo)],
+    key_ring: Annotated[KeyRing, Depends(get_key_ring)],
 ) -> RefreshTokenService:
     return RefreshTokenService(
-        secret_key=settings.token.secret_key,
-        public_key=settings.token.public_key,
-        algorithm=settings.token.algorithm,
+        key_ring=key_ring,
         expires_delta_minutes=settings.token.refresh_token_expire_minutes,
         repo=refresh_token_repo,
         revoked_repo=revoked_refresh_tokens_repo,
+        tokens_epoch_repo=tokens_epoch_repo,
     )
 
 
 def get_access_token_service(
     revoked_refresh_repo: Annotated[RedisRevokedRefreshTokenRepository, Depends(get_revoked_refresh_tokens_repo)],
+    tokens_epoch_repo: Annotated[RedisTokensEpochRepository, Depends(get_tokens_epoch_repo)],
+    key_ring: Annotated[KeyRing, Depends(get_key_ring)],
 ) -> AccessTokenService:
     return AccessTokenService(
-        secret_key=settings.token.secret_key,
-        public_key=settings.token.public_key,
-        algorithm=settings.token.algorithm,
+        key_ring=key_ring,
         expires_delta_minutes=settings.token.access_token_expire_minutes,
         revoked_refresh_repo=revoked_refresh_repo,
+        tokens_epoch_repo=tokens_epoch_repo,
+        verified_cache=verified_access_tokens,
     )
 
 
@@ -81,55 +165,103 @@ def get_auth_service(
     access_token_service: Annotated[AccessTokenService, Depends(get_access_token_service)],
     refresh_token_service: Annotated[RefreshTokenService, Depends(get_refresh_token_service)],
     user_service: Annotated[UserManager, Depends(get_user_manager)],
+    permission_matrix: Annotated[PermissionMatrix, Depends(get_permission_matrix)],
 ):
     return AuthService(
         access_token_service=access_token_service,
         refresh_token_service=refresh_token_service,
         user_service=user_service,
+        permission_matrix=permission_matrix,
     )
 
 
-async def get_current_user(
+async def get_access_token_payload(
     access_token: Annotated[str, Cookie()],
-    user_manager: Annotated[UserManager, Depends(get_user_manager)],
     access_token_service: Annotated[AccessTokenService, Depends(get_access_token_service)],
-) -> User:
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail=ErrorCode.NOT_VALIDATE_CREDENTIALS,
-    )
-
+) -> AccessToken:
     try:
-        payload = await access_token_service.validate_token(access_token)
+        return await access_token_service.validate_token(access_token)
     except BaseTokenServiceError:
-        raise credentials_exception
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=ErrorCode.NOT_VALIDATE_CREDENTIALS,
+        )
 
+
+async def get_current_fresh_user(
+    payload: Annotated[AccessToken, Depends(get_access_token_payload)],
+    user_manager: Annotated[UserManager, Depends(get_user_manager)],
+) -> User:
     try:
-        user = await user_manager.get_user(user_id=payload.sub)
+        with time_stage("pg_user_fetch"):
+            return await user_manager.get_user(user_id=payload.sub)
     except UserNotExistsError:
-        raise credentials_exception
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=ErrorCode.NOT_VALIDATE_CREDENTIALS,
+        )
+
+
+async def get_current_user(
+    payload: Annotated[AccessToken, Depends(get_access_token_payload)],
+    user_manager: Annotated[UserManager, Depends(get_user_manager)],
+) -> User | UserPrincipal:
+    """
+    Return the request user.
+    In stateless mode the user is built from the token claims; tokens issued without a role claim
+    and routes that need current data (see `get_current_fresh_user`) still go to the database.
+    """
+    if settings.api.stateless_principal and payload.role is not None:
+        return UserPrincipal(
+            id=payload.sub,
+            role=payload.role,
+            is_active=bool(payload.is_active),
+            is_verified=bool(payload.is_verified),
+            is_superuser=bool(payload.is_superuser),
+        )
 
-    return user
+    return await get_current_fresh_user(payload, user_manager)
 
 
-async def get_current_user_global(request: AuthRequest, user: Annotated[BaseUser, Depends(get_current_user)]):
+async def get_current_user_global(
+    request: AuthRequest,
+    user: Annotated[BaseUser | UserPrincipal, Depends(get_current_user)],
+    payload: Annotated[AccessToken, Depends(get_access_token_payload)],
+    permission_matrix: Annotated[PermissionMatrix, Depends(get_permission_matrix)],
+):
     request.custom_user = user
+    request.permissions = permission_matrix.resolve(user.role, payload)
 
 
-async def get_current_active_user(current_user: Annotated[User, Depends(get_current_user)]) -> User:
+async def get_current_active_user(
+    current_user: Annotated[User | UserPrincipal, Depends(get_current_user)],
+) -> User | UserPrincipal:
     if not current_user.is_active:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=ErrorCode.INACTIVE_USER)
     return current_user
 
 
-async def get_current_superuser(current_user: Annotated[User, Depends(get_current_user)]) -> User:
+async def get_current_active_fresh_user(current_user: Annotated[User, Depends(get_current_fresh_user)]) -> User:
+    if not current_user.is_active:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=ErrorCode.INACTIVE_USER)
+    return current_user
+
+
+async def get_current_superuser(
+    current_user: Annotated[User | UserPrincipal, Depends(get_current_user)],
+) -> User | UserPrincipal:
     if not current_user.is_superuser:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=ErrorCode.IS_NOT_SUPERUSER)
     return current_user
 
 
 def get_pagination_params(
-    page_number: int = Query(settings.api.default_page_number, gt=0),
     page_size: int = Query(settings.api.default_page_size, gt=0),
+    cursor: str | None = Query(None, description="Value of the X-Next-Cursor header of the previous page"),
 ) -> PaginationParams:
-    return PaginationParams(page_number=page_number, page_size=page_size)
+    try:
+        decoded_cursor = Cursor.decode(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=ErrorCode.INVALID_CURSOR)
+
+    return PaginationParams(page_size=page_size, cursor=decoded_cursor)
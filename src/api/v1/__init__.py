@@ -1,6 +1,7 @@
 from fastapi import APIRouter
 
 from .auth import router as auth_router
+from .internal import router as internal_router
 from .roles import router as roles_router
 from .users import router as users_router
 
@@ -9,3 +10,4 @@ router = APIRouter()
 router.include_router(auth_router)
 router.include_router(users_router)
 router.include_router(roles_router)
+router.include_router(internal_router)
@@ -2,19 +2,26 @@ from typing import Annotated
 
 from fastapi import APIRouter, Cookie, Depends, HTTPException, Request, Response, status
 
-from schemas.tokens import LoginOut
+from entities.tokens import AccessToken
+from schemas.tokens import CheckAccessBatchIn, CheckAccessBatchOut, CheckAccessResult, LoginOut
 from schemas.users import BaseUser, UserCredentials
 from services import exceptions
 from services.auth import AuthService
 from services.exceptions import BaseTokenServiceError, ErrorCode
 from services.users import UserManager, get_user_manager
 
-from ..dependencies import get_auth_service
+from ..dependencies import admit_cpu_bound, get_auth_service, limit_login_rate, limit_register_rate
 
 router = APIRouter(tags=["auth"], prefix="/auth")
 
 
-@router.post("/register", response_model=BaseUser, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/register",
+    response_model=BaseUser,
+    status_code=status.HTTP_201_CREATED,
+    # rate limits are checked before a request takes an admission slot
+    dependencies=[Depends(limit_register_rate), Depends(admit_cpu_bound)],
+)
 async def create_user(
     user_create: UserCredentials, user_manager: Annotated[UserManager, Depends(get_user_manager)]
 ) -> BaseUser:
@@ -32,7 +39,7 @@ async def create_user(
     return BaseUser.model_validate(created_user)
 
 
-@router.post("/login")
+@router.post("/login", dependencies=[Depends(limit_login_rate), Depends(admit_cpu_bound)])
 async def login_for_access_token(
     request: Request,
     response: Response,
@@ -90,7 +97,7 @@ async def logout_all(
     return {"detail": "OK"}
 
 
-@router.post("/refresh")
+@router.post("/refresh", dependencies=[Depends(admit_cpu_bound)])
 async def refresh(
     request: Request,
     response: Response,
@@ -123,3 +130,21 @@ async def check_access(
     response.status_code = status.HTTP_200_OK
 
     return {"detail": "OK"}
+
+
+@router.post("/check_access/batch")
+async def check_access_batch(
+    batch: CheckAccessBatchIn,
+    auth_service: Annotated[AuthService, Depends(get_auth_service)],
+) -> CheckAccessBatchOut:
+    """Проверка нескольких access токенов за один запрос"""
+    results = await auth_service.check_access_batch(batch.access_tokens)
+
+    return CheckAccessBatchOut(
+        results=[
+            CheckAccessResult(valid=True, claims=result)
+            if isinstance(result, AccessToken)
+            else CheckAccessResult(valid=False, error=result.code)
+            for result in results
+        ]
+    )
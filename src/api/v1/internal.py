@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from api.dependencies import get_current_user_global, permissions_required
+from db import postgres
+from db.pool import InstrumentedAsyncPool
+from models.roles import Permission
+from schemas.auth_request import AuthRequest
+from schemas.internal import AdmissionStats, DbPoolStats
+from services import admission
+
+router = APIRouter(tags=["internal"], prefix="/internal", dependencies=[Depends(get_current_user_global)])
+
+
+@router.get(
+    "/db-pool",
+    response_model=DbPoolStats,
+    name="db_pool_stats",
+    summary="Статистика пула соединений с базой",
+    status_code=status.HTTP_200_OK,
+)
+@permissions_required(Permission.INTERNAL_READ)
+async def get_db_pool_stats(request: AuthRequest) -> DbPoolStats:
+    pool = postgres.engine.pool
+    if not isinstance(pool, InstrumentedAsyncPool):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    return DbPoolStats.model_validate(pool.stats())
+
+
+@router.get(
+    "/admission",
+    response_model=AdmissionStats,
+    name="admission_stats",
+    summary="Статистика очереди тяжёлых запросов этого воркера",
+    status_code=status.HTTP_200_OK,
+)
+@permissions_required(Permission.INTERNAL_READ)
+async def get_admission_stats(request: AuthRequest) -> AdmissionStats:
+    if admission.controller is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    return AdmissionStats.model_validate(admission.controller.stats())
@@ -2,12 +2,11 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, Response, status
 
-from api.dependencies import get_current_user_global, roles_required
-from api.v1.users import user_roles
-from models.roles import Role
+from api.dependencies import get_current_user_global, permissions_required
+from models.roles import Permission, Role
 from schemas.auth_request import AuthRequest
 from schemas.roles import BaseRole, RoleCreate, RoleUpdate
-from services.exceptions import RoleNotExistsError
+from services.exceptions import ErrorCode, RoleAlreadyExistsError, RoleNotExistsError
 from services.roles import RoleManager, get_role_manager
 
 router = APIRouter(tags=["roles"], prefix="/roles", dependencies=[Depends(get_current_user_global)])
@@ -27,11 +26,14 @@ async def get_role_or_404(id: str, role_manager: Annotated[RoleManager, Depends(
     summary="Создание роли",
     status_code=status.HTTP_201_CREATED,
 )
-@roles_required(roles_list=[user_roles.admin, user_roles.superuser])
+@permissions_required(Permission.ROLES_WRITE)
 async def create_role(
     request: AuthRequest, role_create: RoleCreate, role_manager: Annotated[RoleManager, Depends(get_role_manager)]
 ) -> BaseRole:
-    role = await role_manager.create(role_create)
+    try:
+        role = await role_manager.create(role_create)
+    except RoleAlreadyExistsError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=ErrorCode.ROLE_ALREADY_EXISTS)
     return BaseRole.model_validate(role)
 
 
@@ -42,7 +44,7 @@ async def create_role(
     summary="Список ролей",
     status_code=status.HTTP_200_OK,
 )
-@roles_required(roles_list=[user_roles.admin, user_roles.superuser])
+@permissions_required(Permission.ROLES_READ)
 async def get_roles(
     request: AuthRequest, role_manager: Annotated[RoleManager, Depends(get_role_manager)]
 ) -> list[BaseRole]:
@@ -57,7 +59,7 @@ async def get_roles(
     summary="Получение роли",
     status_code=status.HTTP_200_OK,
 )
-@roles_required(roles_list=[user_roles.admin, user_roles.superuser])
+@permissions_required(Permission.ROLES_READ)
 async def get_role(request: AuthRequest, role: Annotated[Role, Depends(get_role_or_404)]) -> BaseRole:
     return BaseRole.model_validate(role)
 
@@ -69,14 +71,17 @@ async def get_role(request: AuthRequest, role: Annotated[Role, Depends(get_role_
     summary="Изменение роли",
     status_code=status.HTTP_200_OK,
 )
-@roles_required(roles_list=[user_roles.admin, user_roles.superuser])
+@permissions_required(Permission.ROLES_WRITE)
 async def update_role(
     request: AuthRequest,
     role_update: RoleUpdate,
     role: Annotated[Role, Depends(get_role_or_404)],
     role_manager: Annotated[RoleManager, Depends(get_role_manager)],
 ) -> BaseRole:
-    updated_role = await role_manager.update(role_update, role)
+    try:
+        updated_role = await role_manager.update(role_update, role)
+    except RoleAlreadyExistsError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=ErrorCode.ROLE_ALREADY_EXISTS)
     return BaseRole.model_validate(updated_role)
 
 
@@ -87,7 +92,7 @@ async def update_role(
     summary="Удаление роли",
     status_code=status.HTTP_204_NO_CONTENT,
 )
-@roles_required(roles_list=[user_roles.admin, user_roles.superuser])
+@permissions_required(Permission.ROLES_WRITE)
 async def delete_role(
     request: AuthRequest,
     role: Annotated[Role, Depends(get_role_or_404)],
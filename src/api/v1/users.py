@@ -1,18 +1,28 @@
-from typing import Annotated
+from datetime import datetime
+from typing import Annotated, AsyncIterator
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
 
-from models.users import User, UserRoles
+from models.roles import Permission
+from models.users import User
 from schemas.auth_request import AuthRequest
-from schemas.users import BaseUser, LoginHistory, PaginationParams, UserLoginHistory, UserUpdate
+from schemas.pagination import PaginationParams
+from schemas.users import BaseUser, LoginHistory, UserExport, UserLoginHistory, UserUpdate
 from services.exceptions import UserNotExistsError
-from services.users import UserManager, get_user_manager
-
-from ..dependencies import get_current_active_user, get_current_user_global, get_pagination_params, roles_required
+from services.users import UserManager, get_user_manager, stream_users
+
+from ..dependencies import (
+    get_current_active_fresh_user,
+    get_current_active_user,
+    get_current_user_global,
+    get_pagination_params,
+    permissions_required,
+)
 
 router = APIRouter(tags=["users"], prefix="/users", dependencies=[Depends(get_current_user_global)])
 
-user_roles = UserRoles()
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
 
 
 async def get_user_or_404(
@@ -32,16 +42,41 @@ async def get_user_or_404(
     summary="Получение списка пользователей",
     status_code=status.HTTP_200_OK,
 )
-@roles_required(roles_list=[user_roles.admin, user_roles.superuser])
+@permissions_required(Permission.USERS_READ)
 async def get_users(
     request: AuthRequest,
+    response: Response,
     pagination: Annotated[PaginationParams, Depends(get_pagination_params)],
     user_manager: Annotated[UserManager, Depends(get_user_manager)],
 ) -> list[BaseUser]:
-    results = await user_manager.get_users(page_size=pagination.page_size, page_number=pagination.page_number)
+    results, next_cursor = await user_manager.get_users(page_size=pagination.page_size, cursor=pagination.cursor)
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor.encode()
     return [BaseUser.model_validate(result) for result in results]
 
 
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    name="export_users",
+    summary="Выгрузка пользователей в NDJSON",
+    status_code=status.HTTP_200_OK,
+    responses={status.HTTP_200_OK: {"content": {"application/x-ndjson": {}}}},
+)
+@permissions_required(Permission.USERS_READ)
+async def export_users(request: AuthRequest, updated_since: datetime | None = None) -> StreamingResponse:
+    """
+    One JSON user per line in (updated_at, id) order, streamed from a server-side cursor.
+    `updated_since` limits the export to users changed at or after that moment.
+    """
+
+    async def lines() -> AsyncIterator[bytes]:
+        async for users in stream_users(updated_since):
+            yield b"".join(UserExport.model_validate(user).model_dump_json().encode() + b"\n" for user in users)
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 @router.get(
     "/me",
     name="user_me",
@@ -49,7 +84,7 @@ async def get_users(
     response_model=BaseUser,
     status_code=status.HTTP_200_OK,
 )
-async def read_users_me(current_user: Annotated[User, Depends(get_current_active_user)]) -> BaseUser:
+async def read_users_me(current_user: Annotated[User, Depends(get_current_active_fresh_user)]) -> BaseUser:
     return BaseUser.model_validate(current_user)
 
 
@@ -61,13 +96,16 @@ async def read_users_me(current_user: Annotated[User, Depends(get_current_active
     status_code=status.HTTP_200_OK,
 )
 async def read_users_login_history(
+    response: Response,
     current_user: Annotated[UserLoginHistory, Depends(get_current_active_user)],
     pagination: Annotated[PaginationParams, Depends(get_pagination_params)],
     user_manager: Annotated[UserManager, Depends(get_user_manager)],
 ) -> list[LoginHistory]:
-    results = await user_manager.get_login_history(
-        user_id=current_user.id, page_size=pagination.page_size, page_number=pagination.page_number
+    results, next_cursor = await user_manager.get_login_history(
+        user_id=current_user.id, page_size=pagination.page_size, cursor=pagination.cursor
     )
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor.encode()
     return [LoginHistory.model_validate(result) for result in results]
 
 
@@ -78,7 +116,7 @@ async def read_users_login_history(
     response_model=BaseUser,
     status_code=status.HTTP_200_OK,
 )
-@roles_required(roles_list=[user_roles.admin, user_roles.superuser])
+@permissions_required(Permission.USERS_READ)
 async def get_user(request: AuthRequest, user: Annotated[User, Depends(get_user_or_404)]):
     return BaseUser.model_validate(user)
 
@@ -90,7 +128,7 @@ async def get_user(request: AuthRequest, user: Annotated[User, Depends(get_user_
     summary="Изменение данных пользователя",
     status_code=status.HTTP_200_OK,
 )
-@roles_required(roles_list=[user_roles.admin, user_roles.superuser])
+@permissions_required(Permission.USERS_WRITE)
 async def update_role(
     request: AuthRequest,
     user_update: UserUpdate,
@@ -0,0 +1,22 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Header, Response, status
+
+from services.keys import KeyRing, get_key_ring
+from settings import settings
+
+router = APIRouter(tags=["keys"], prefix="/.well-known")
+
+
+@router.get("/jwks.json", name="jwks", summary="Публичные ключи для проверки токенов")
+async def get_jwks(
+    key_ring: Annotated[KeyRing, Depends(get_key_ring)],
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
+    headers = {
+        "Cache-Control": f"public, max-age={settings.token.jwks_max_age}",
+        "ETag": key_ring.jwks_etag,
+    }
+    if if_none_match == key_ring.jwks_etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=key_ring.jwks, media_type="application/json", headers=headers)
@@ -1,6 +1,7 @@
 import contextlib
 from functools import wraps
-from typing import Annotated
+from pathlib import Path
+from typing import Annotated, Optional, cast
 
 import anyio
 import typer
@@ -12,8 +13,13 @@ from db.postgres import get_session
 from db.users import get_user_db
 from schemas.users import UserCredentials
 from services.exceptions import UserAlreadyExistsError
+from services.password_hasher import create_password_hasher
+from services.refresh_tokens import purge_refresh_tokens
+from services.user_import import BatchReport, ImportFormat, ImportMethod, import_users
 from services.users import get_user_manager
+from settings import settings
 
+app = typer.Typer()
 err_console = Console(stderr=True)
 
 get_async_session_context = contextlib.asynccontextmanager(get_session)
@@ -44,8 +50,9 @@ async def create_user(credentials: UserCredentials, is_superuser: bool = False):
         raise typer.Abort()
 
 
+@app.command("create-superuser")
 @run_async
-async def main(email: Annotated[str, typer.Option()], password: Annotated[str, typer.Option()]):
+async def create_superuser(email: Annotated[str, typer.Option()], password: Annotated[str, typer.Option()]):
     try:
         credentials = UserCredentials(email=email, password=password)
         await create_user(credentials, True)
@@ -55,5 +62,60 @@ async def main(email: Annotated[str, typer.Option()], password: Annotated[str, t
         raise typer.Abort()
 
 
+@app.command("purge-refresh-tokens")
+@run_async
+async def purge_tokens(
+    batch_size: Annotated[int, typer.Option()] = settings.token.refresh_token_purge_batch_size,
+):
+    deleted = await purge_refresh_tokens(batch_size)
+    print(f"[bold green]Deleted {deleted} expired or revoked refresh tokens[/bold green]")
+
+
+def print_batch(batch: BatchReport) -> None:
+    print(
+        f"batch {batch.number}: {batch.rows} rows, {batch.inserted} inserted, {batch.skipped} skipped, "
+        f"{batch.rows_per_second:.0f} rows/s (hash {batch.hash_seconds:.2f}s, load {batch.load_seconds:.2f}s)"
+    )
+
+
+@app.command("import-users")
+@run_async
+async def import_users_command(
+    path: Annotated[Path, typer.Argument(exists=True, dir_okay=False, readable=True)],
+    format: Annotated[Optional[str], typer.Option(help="csv or jsonl, by default from the file extension")] = None,
+    batch_size: Annotated[int, typer.Option(min=1)] = 5000,
+    method: Annotated[str, typer.Option(help="copy or insert")] = "copy",
+):
+    """
+    Import users from CSV or JSONL with the columns email, password or hashed_password,
+    and optionally id, role, is_active and is_verified. Users whose id or email already exists are skipped.
+    """
+    import_format = format or path.suffix.lstrip(".").lower()
+    if import_format not in ("csv", "jsonl") or method not in ("copy", "insert"):
+        err_console.log("format must be csv or jsonl and method copy or insert")
+        raise typer.Abort()
+
+    # an import queues whole batches on the pool, nothing to shed there
+    hasher = create_password_hasher(settings.hashing.model_copy(update={"hashing_max_queued": None}))
+    try:
+        report = await import_users(
+            path,
+            cast(ImportFormat, import_format),
+            hasher,
+            batch_size=batch_size,
+            method=cast(ImportMethod, method),
+            on_batch=print_batch,
+        )
+    finally:
+        await hasher.shutdown()
+
+    for line_number, reason in report.invalid[:20]:
+        err_console.log(f"line {line_number}: {reason}")
+    print(
+        f"[bold green]Imported {report.inserted} users, {report.skipped} already existed, "
+        f"{len(report.invalid)} invalid rows, {report.rows_per_second:.0f} rows/s[/bold green]"
+    )
+
+
 if __name__ == "__main__":
-    typer.run(main)
+    app()
@@ -0,0 +1,102 @@
+from datetime import date, datetime
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from db import postgres
+from settings import settings
+
+LOGIN_HISTORY_TABLE = "login_histories"
+
+
+def _month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def _add_months(day: date, months: int) -> date:
+    month_index = day.year * 12 + day.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def _partition_name(table: str, month: date) -> str:
+    return f"{table}_y{month.year}m{month.month:02d}"
+
+
+def _default_partition_name(table: str) -> str:
+    return f"{table}_default"
+
+
+async def create_default_partition(conn: AsyncConnection, table: str) -> None:
+    """Create the partition catching rows of months that have no partition of their own."""
+    await conn.execute(
+        text(f"CREATE TABLE IF NOT EXISTS {_default_partition_name(table)} PARTITION OF {table} DEFAULT")
+    )
+
+
+async def create_monthly_partitions(conn: AsyncConnection, table: str, months_ahead: int) -> None:
+    """
+    Create partitions from the current month up to `months_ahead` months in the future.
+    Rows the default partition already holds for a new month are moved into its partition,
+    so the default partition must exist.
+    """
+    current_month = _month_start(datetime.utcnow().date())
+    default = _default_partition_name(table)
+    in_month = f"FROM {default} WHERE created_at >= :start AND created_at < :end"  # noqa: S608
+    for offset in range(months_ahead + 1):
+        month = _add_months(current_month, offset)
+        partition = _partition_name(table, month)
+        if (await conn.execute(text("SELECT to_regclass(:name)"), {"name": partition})).scalar() is not None:
+            continue
+
+        bounds = {"start": month, "end": _add_months(month, 1)}
+        attach = f"FOR VALUES FROM ('{bounds['start'].isoformat()}') TO ('{bounds['end'].isoformat()}')"
+        if not (await conn.execute(text(f"SELECT EXISTS (SELECT 1 {in_month})"), bounds)).scalar():
+            await conn.execute(text(f"CREATE TABLE {partition} PARTITION OF {table} {attach}"))
+            continue
+
+        # a partition can't be created over rows of the default one, move them and attach the filled table
+        await conn.execute(text(f"CREATE TABLE {partition} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+        move = f"WITH moved AS (DELETE {in_month} RETURNING *) INSERT INTO {partition} SELECT * FROM moved"  # noqa: S608
+        await conn.execute(text(move), bounds)
+        await conn.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {partition} {attach}"))
+
+
+async def drop_expired_partitions(conn: AsyncConnection, table: str, retention_months: int) -> list[str]:
+    """Drop partitions that only hold rows older than `retention_months` full months."""
+    cutoff = _add_months(_month_start(datetime.utcnow().date()), -retention_months)
+    result = await conn.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON pg_inherits.inhparent = parent.oid "
+            "JOIN pg_class child ON pg_inherits.inhrelid = child.oid "
+            "WHERE parent.relname = :table"
+        ),
+        {"table": table},
+    )
+
+    dropped = []
+    for (partition,) in result.all():
+        suffix = partition.removeprefix(f"{table}_y")
+        try:
+            month = date(int(suffix[:4]), int(suffix[5:7]), 1)
+        except ValueError:
+            continue
+        if _add_months(month, 1) <= cutoff:
+            await conn.execute(text(f"DROP TABLE IF EXISTS {partition}"))
+            dropped.append(partition)
+
+    return dropped
+
+
+async def maintain_login_history_partitions() -> None:
+    """Create upcoming login history partitions and drop the ones past retention."""
+    history_settings = settings.login_history
+    async with postgres.engine.begin() as conn:
+        if conn.dialect.name != "postgresql":
+            return
+        # every worker runs this at startup, concurrent DDL on the same partitions fails or deadlocks
+        await conn.execute(text("SELECT pg_advisory_xact_lock(hashtext(:name))"), {"name": LOGIN_HISTORY_TABLE})
+        await create_default_partition(conn, LOGIN_HISTORY_TABLE)
+        await create_monthly_partitions(conn, LOGIN_HISTORY_TABLE, history_settings.login_history_partitions_ahead)
+        if history_settings.login_history_retention_months > 0:
+            await drop_expired_partitions(conn, LOGIN_HISTORY_TABLE, history_settings.login_history_retention_months)
@@ -2,6 +2,7 @@ from typing import AsyncGenerator
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
+from db.pool import InstrumentedAsyncPool
 from models import Base
 from settings import settings
 
@@ -9,7 +10,21 @@ dsn = (
     f"postgresql+asyncpg://{settings.pg.db_user}:{settings.pg.db_password}@"
     f"{settings.pg.db_host}:{settings.pg.db_port}/{settings.pg.db_name}"
 )
-engine = create_async_engine(dsn, echo=settings.project.debug, future=True)
+engine = create_async_engine(
+    dsn,
+    echo=settings.project.debug,
+    future=True,
+    poolclass=InstrumentedAsyncPool,
+    pool_size=settings.pg.db_pool_size,
+    max_overflow=settings.pg.db_max_overflow,
+    pool_timeout=settings.pg.db_pool_timeout,
+    pool_recycle=settings.pg.db_pool_recycle,
+    pool_pre_ping=settings.pg.db_pool_pre_ping,
+    connect_args={
+        "statement_cache_size": settings.pg.db_statement_cache_size,
+        "prepared_statement_cache_size": settings.pg.db_statement_cache_size,
+    },
+)
 async_session = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
 
 
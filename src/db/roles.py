@@ -3,27 +3,46 @@ from typing import Annotated, Any, Type
 from fastapi import Depends
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 from sqlalchemy.sql import Executable
 
 from db.postgres import get_session
 from models.roles import Role
+from repositories.roles.roles_catalog import RolesCatalog, get_roles_catalog
+from schemas.roles import CachedRole
+from tracing import traced_query
 
 
 class RoleDatabase:
-    def __init__(self, session: AsyncSession, role_model: Type[Role]):
+    def __init__(self, session: AsyncSession, role_model: Type[Role], catalog: RolesCatalog | None = None):
         self.session = session
         self.role_model = role_model
+        self.catalog = catalog
 
+    @traced_query
     async def all(self):
+        if self.catalog is not None and self.catalog.ready:
+            return [self._from_catalog(role) for role in self.catalog.all()]
+
         statement = select(self.role_model)
         results = await self.session.execute(statement)
         return list(results.scalars())
 
+    @traced_query
     async def get(self, id: str) -> Role | None:
+        if self.catalog is not None and self.catalog.ready:
+            cached = self.catalog.get(id)
+            return self._from_catalog(cached) if cached is not None else None
+
         statement = select(self.role_model).where(self.role_model.id == id)
         return await self._get_role(statement)
 
+    @traced_query
     async def get_by_title(self, title: str) -> Role | None:
+        if self.catalog is not None and self.catalog.ready:
+            cached = self.catalog.get_by_title(title)
+            return self._from_catalog(cached) if cached is not None else None
+
         statement = select(self.role_model).where(func.lower(self.role_model.title) == title.lower())
         return await self._get_role(statement)
 
@@ -31,6 +50,13 @@ class RoleDatabase:
         results = await self.session.execute(statement)
         return results.unique().scalar_one_or_none()
 
+    def _from_catalog(self, cached: CachedRole) -> Role:
+        # a fresh detached instance per call, update/delete attach it to this session
+        role = self.role_model(**cached.model_dump())
+        make_transient_to_detached(role)
+        return role
+
+    @traced_query
     async def create(self, role_create: dict[str, Any]) -> Role:
         role = self.role_model(**role_create)
         self.session.add(role)
@@ -38,6 +64,7 @@ class RoleDatabase:
         await self.session.refresh(role)
         return role
 
+    @traced_query
     async def update(self, role: Role, update_dict: dict[str, Any]) -> Role:
         for key, value in update_dict.items():
             setattr(role, key, value)
@@ -46,10 +73,14 @@ class RoleDatabase:
         await self.session.refresh(role)
         return role
 
+    @traced_query
     async def delete(self, role: Role) -> None:
         await self.session.delete(role)
         await self.session.commit()
 
 
-async def get_role_db(session: Annotated[AsyncSession, Depends(get_session)]):
-    yield RoleDatabase(session, Role)
+async def get_role_db(
+    session: Annotated[AsyncSession, Depends(get_session)],
+    catalog: Annotated[RolesCatalog | None, Depends(get_roles_catalog)] = None,
+):
+    yield RoleDatabase(session, Role, catalog)
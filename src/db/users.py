@@ -1,34 +1,78 @@
-from typing import Annotated, Any, Type
+from datetime import datetime
+from typing import Annotated, Any, AsyncIterator, Type
 from uuid import UUID
 
 from fastapi import Depends
-from sqlalchemy import func, select
+from redis.asyncio import Redis
+from sqlalchemy import column, func, select, table, text, tuple_
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer, make_transient_to_detached
+from sqlalchemy.orm.util import identity_key
 from sqlalchemy.sql import Executable
 
 from db.postgres import get_session
+from db.redis_db import get_redis
 from models.users import LoginHistory, User
+from repositories.users.redis_user_cache import RedisUserCacheRepository
+from schemas.pagination import Cursor
+from schemas.users import CachedUser
+from tracing import traced_query
 
 
 class UserDatabase:
-    def __init__(self, session: AsyncSession, user_model: Type[User]):
+    def __init__(self, session: AsyncSession, user_model: Type[User], cache: RedisUserCacheRepository | None = None):
         self.session = session
         self.user_model = user_model
         self.history_model = LoginHistory
+        self.cache = cache
 
-    async def all(self, limit: int | None, offset: int | None) -> list[User]:
-        statement = select(self.user_model).limit(limit).offset(offset).order_by(self.user_model.created_at)
+    @traced_query
+    async def all(self, limit: int, after: Cursor | None = None) -> list[User]:
+        statement = (
+            select(self.user_model)
+            .options(defer(self.user_model.hashed_password))
+            .order_by(self.user_model.created_at, self.user_model.id)
+            .limit(limit)
+        )
+        if after is not None:
+            statement = statement.where(
+                tuple_(self.user_model.created_at, self.user_model.id) > (after.created_at, after.id)
+            )
         results = await self.session.execute(statement)
         return list(results.scalars())
 
+    async def stream(self, updated_since: datetime | None = None, batch_size: int = 1000) -> AsyncIterator[list[User]]:
+        """Users in (updated_at, id) order, read through a server-side cursor `batch_size` rows at a time."""
+        statement = (
+            select(self.user_model)
+            .options(defer(self.user_model.hashed_password))
+            .order_by(self.user_model.updated_at, self.user_model.id)
+            .execution_options(yield_per=batch_size)
+        )
+        if updated_since is not None:
+            statement = statement.where(self.user_model.updated_at >= updated_since)
+        results = await self.session.stream_scalars(statement)
+        async for users in results.partitions():
+            yield list(users)
+
+    @traced_query
     async def get(self, id: str) -> User | None:
+        if self.cache is not None and (cached := await self.cache.get(id)) is not None:
+            return self._from_cache(cached)
+
         statement = select(self.user_model).where(self.user_model.id == id)
-        return await self._get_user(statement)
+        return await self._cache_user(await self._get_user(statement))
 
+    @traced_query
     async def get_by_email(self, email: str) -> User | None:
+        if self.cache is not None and (cached := await self.cache.get_by_email(email)) is not None:
+            return self._from_cache(cached)
+
         statement = select(self.user_model).where(func.lower(self.user_model.email) == email.lower())
-        return await self._get_user(statement)
+        return await self._cache_user(await self._get_user(statement))
 
+    @traced_query
     async def create(self, user_create: dict[str, Any]) -> User:
         user = self.user_model(**user_create)
         self.session.add(user)
@@ -36,34 +80,96 @@ class UserDatabase:
         await self.session.refresh(user)
         return user
 
+    @traced_query
     async def update(self, user: User, update_dict: dict[str, Any]) -> User:
+        old_email = user.email
         for key, value in update_dict.items():
             setattr(user, key, value)
         self.session.add(user)
         await self.session.commit()
         await self.session.refresh(user)
+        if self.cache is not None:
+            await self.cache.delete(str(user.id), old_email, user.email)
         return user
 
+    @traced_query
     async def delete(self, user: User) -> None:
         await self.session.delete(user)
         await self.session.commit()
+        if self.cache is not None:
+            await self.cache.delete(str(user.id), user.email)
 
-    async def add_login_history(self, user: User, history_dict: dict[str, Any]) -> None:
-        login_history = LoginHistory(**history_dict)
-        self.session.add(login_history)
+    @traced_query
+    async def insert_many(self, rows: list[dict[str, Any]]) -> int:
+        """Multi-row insert that skips rows whose id or email already exist, returns the number inserted."""
+        statement = insert(self.user_model).on_conflict_do_nothing().returning(self.user_model.id)
+        results = await self.session.execute(statement, rows)
+        await self.session.commit()
+        return len(results.all())
+
+    @traced_query
+    async def copy_many(self, rows: list[dict[str, Any]]) -> int:
+        """
+        Same as `insert_many` through COPY: rows are copied into a temporary table
+        and moved to users with a single INSERT ... ON CONFLICT DO NOTHING.
+        """
+        columns = list(rows[0])
+        staging = table("users_import", *(column(name) for name in columns))
+        await self.session.execute(
+            text("CREATE TEMP TABLE IF NOT EXISTS users_import (LIKE users INCLUDING DEFAULTS) ON COMMIT DELETE ROWS")
+        )
+        connection = await (await self.session.connection()).get_raw_connection()
+        await connection.driver_connection.copy_records_to_table(  # type: ignore[union-attr]
+            "users_import", records=[tuple(row[name] for name in columns) for row in rows], columns=columns
+        )
+        statement = insert(self.user_model).from_select(columns, select(staging)).on_conflict_do_nothing()
+        result = await self.session.execute(statement)
+        await self.session.commit()
+        return result.rowcount  # type: ignore[attr-defined]
+
+    @traced_query
+    async def add_login_history(self, history_dict: dict[str, Any]) -> None:
+        self.session.add(LoginHistory(**history_dict))
         await self.session.commit()
-        await self.session.refresh(user)
-        await self.session.refresh(login_history)
 
     async def _get_user(self, statement: Executable) -> User | None:
         results = await self.session.execute(statement)
         return results.unique().scalar_one_or_none()
 
-    async def get_login_history(self, user_id: UUID, limit: int | None, offset: int | None) -> list[LoginHistory]:
-        statement = select(self.history_model).where(self.history_model.user_id == user_id).limit(limit).offset(offset)
+    async def _cache_user(self, user: User | None) -> User | None:
+        if user is not None and self.cache is not None:
+            await self.cache.save(CachedUser.model_validate(user))
+        return user
+
+    def _from_cache(self, cached: CachedUser) -> User:
+        # a row already loaded in this session must be reused, the session can't hold two instances of it
+        loaded = self.session.identity_map.get(identity_key(self.user_model, cached.id))
+        if loaded is not None:
+            return loaded
+        # detached instance with an identity, so update/delete can attach it to the session
+        user = self.user_model(**cached.model_dump())
+        make_transient_to_detached(user)
+        return user
+
+    @traced_query
+    async def get_login_history(self, user_id: UUID, limit: int, before: Cursor | None = None) -> list[LoginHistory]:
+        statement = (
+            select(self.history_model)
+            .where(self.history_model.user_id == user_id)
+            .order_by(self.history_model.created_at.desc(), self.history_model.id.desc())
+            .limit(limit)
+        )
+        if before is not None:
+            statement = statement.where(
+                tuple_(self.history_model.created_at, self.history_model.id) < (before.created_at, before.id)
+            )
         results = await self.session.execute(statement)
         return list(results.scalars())
 
 
-async def get_user_db(session: Annotated[AsyncSession, Depends(get_session)]):
-    yield UserDatabase(session, User)
+async def get_user_db(
+    session: Annotated[AsyncSession, Depends(get_session)],
+    redis_client: Annotated[Redis | None, Depends(get_redis)] = None,
+):
+    cache = RedisUserCacheRepository(client=redis_client) if redis_client is not None else None
+    yield UserDatabase(session, User, cache)
@@ -20,3 +20,7 @@ class AccessToken(JWTToken):
     is_superuser: bool | None
     is_verified: bool | None
     is_active: bool | None
+    role: str | None = None
+    # permission bits of the role and the roles version they were read at, see PermissionMatrix
+    perm: int | None = None
+    pv: int | None = None
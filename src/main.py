@@ -1,3 +1,4 @@
+import logging
 from contextlib import asynccontextmanager
 
 import uvicorn
@@ -5,19 +6,76 @@ from fastapi import FastAPI
 from redis.asyncio import Redis
 
 from api import router as api_router
-from db import redis_db
-from db.postgres import create_database
+from api.well_known import router as well_known_router
+from db import postgres, redis_db
+from db.partitions import maintain_login_history_partitions
+from db.pool import warm_up_pool
+from db.postgres import async_session, create_database
+from metrics import PrometheusMiddleware, metrics
+from repositories.refresh_tokens import revocation_cache
+from repositories.roles import roles_catalog
+from repositories.roles.redis_roles_version import RedisRolesVersionRepository
+from services import admission, keys, login_history_writer, password_hasher
+from services.periodic_tasks import PeriodicTask
+from services.refresh_tokens import purge_refresh_tokens
 from settings import settings
+from tracing import TracingMiddleware, configure_tracing
+
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    tracer_provider = configure_tracing(settings.tracing)
+    keys.key_ring = keys.load_key_ring(settings.token)
     await create_database()
     redis_db.redis = Redis(host=settings.redis.redis_host, port=settings.redis.redis_port)
+    roles_catalog.catalog = roles_catalog.RolesCatalog(
+        RedisRolesVersionRepository(client=redis_db.redis), async_session
+    )
+    await roles_catalog.catalog.sync()
+    roles_sync_task = PeriodicTask("roles_sync", roles_catalog.catalog.sync, settings.api.roles_sync_interval)
+    roles_sync_task.start()
+    if settings.pg.db_pool_warm_up:
+        await warm_up_pool(postgres.engine, settings.pg.db_pool_size)
+    try:
+        await maintain_login_history_partitions()
+    except Exception:
+        # the periodic task retries, a worker must not fail to start over it
+        logger.exception("Login history partition maintenance failed")
+    partitions_task = PeriodicTask(
+        "login_history_partitions",
+        maintain_login_history_partitions,
+        settings.login_history.login_history_maintenance_interval,
+    )
+    partitions_task.start()
+    refresh_tokens_purge_task = PeriodicTask(
+        "refresh_tokens_purge", purge_refresh_tokens, settings.token.refresh_token_purge_interval
+    )
+    refresh_tokens_purge_task.start()
+    if settings.redis.revocation_cache_enabled:
+        revocation_cache.cache = revocation_cache.RevocationCache(redis_db.redis)
+        revocation_cache.cache.start()
+    password_hasher.hasher = password_hasher.create_password_hasher(settings.hashing)
+    admission.controller = admission.create_admission_controller(settings.admission)
+    login_history_writer.writer = login_history_writer.create_login_history_writer(
+        async_session, settings.login_history
+    )
+    login_history_writer.writer.start()
 
     yield
 
+    await login_history_writer.writer.stop()
+    await partitions_task.stop()
+    await refresh_tokens_purge_task.stop()
+    await roles_sync_task.stop()
+    await password_hasher.hasher.shutdown()
+    if revocation_cache.cache is not None:
+        await revocation_cache.cache.stop()
     await redis_db.redis.close()
+    await postgres.engine.dispose()
+    if tracer_provider is not None:
+        tracer_provider.shutdown()
 
 
 app = FastAPI(
@@ -29,6 +87,11 @@ app = FastAPI(
 )
 
 app.include_router(api_router, prefix="/api")
+app.include_router(well_known_router)
+app.add_route("/metrics", metrics, include_in_schema=False)
+app.add_middleware(PrometheusMiddleware)
+# outermost, so the request span covers the metrics middleware too
+app.add_middleware(TracingMiddleware)
 
 if __name__ == "__main__":
     uvicorn.run(
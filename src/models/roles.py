@@ -1,19 +1,47 @@
 import uuid
 from datetime import datetime
+from enum import IntFlag
+from typing import Iterable
 
-from sqlalchemy import DateTime, String
+from sqlalchemy import BigInteger, DateTime, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import Base
 
 
+class Permission(IntFlag):
+    """Bits of a role's permission set, stored in `roles.permissions` and the `perm` access token claim."""
+
+    USERS_READ = 1
+    USERS_WRITE = 2
+    ROLES_READ = 4
+    ROLES_WRITE = 8
+    INTERNAL_READ = 16
+
+    @classmethod
+    def all(cls) -> "Permission":
+        return cls(sum(cls))
+
+    @classmethod
+    def from_names(cls, names: Iterable[str]) -> "Permission":
+        permissions = cls(0)
+        for name in names:
+            permissions |= cls[name]
+        return permissions
+
+    @property
+    def names(self) -> list[str]:
+        return [permission.name for permission in self if permission.name is not None]
+
+
 class Role(Base):
     __tablename__ = "roles"
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False)
     title: Mapped[str] = mapped_column(String(length=255), unique=True, index=True, nullable=False)
-    description: Mapped[str] = mapped_column(String(length=1024))
+    description: Mapped[str | None] = mapped_column(String(length=1024), nullable=True)
+    permissions: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0", nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
     def __repr__(self) -> str:
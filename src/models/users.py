@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 
 from pydantic import BaseModel
-from sqlalchemy import Boolean, DateTime, ForeignKey, String
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -17,6 +17,10 @@ class UserRoles(BaseModel):
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_created_at_id", "created_at", "id"),
+        Index("ix_users_updated_at_id", "updated_at", "id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False)
     email: Mapped[str] = mapped_column(String(length=320), unique=True, index=True, nullable=False)
@@ -25,11 +29,17 @@ class User(Base):
     is_superuser: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     is_verified: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    # order and filter of the users export, see UserDatabase.stream
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
+    # tokens issued at or before this moment are revoked, see RefreshTokenService.revoke_user_tokens
+    tokens_valid_after: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
     role: Mapped[str] = mapped_column(String(length=255))
 
     login_histories: Mapped[list["LoginHistory"]] = relationship(
-        back_populates="user", cascade="all, delete-orphan", lazy="selectin", order_by="LoginHistory.created_at"
+        back_populates="user", cascade="all, delete-orphan", lazy="raise_on_sql", order_by="LoginHistory.created_at"
     )
 
     def __repr__(self) -> str:
@@ -38,12 +48,17 @@ class User(Base):
 
 class LoginHistory(Base):
     __tablename__ = "login_histories"
+    __table_args__ = (
+        Index("ix_login_histories_user_id_created_at_id", "user_id", "created_at", "id"),
+        # monthly partitions are created and dropped by db.partitions
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False)
     useragent: Mapped[str] = mapped_column(String(length=512))
     remote_addr: Mapped[str] = mapped_column(String(length=100))
     referer: Mapped[str] = mapped_column(String(length=255))
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, primary_key=True, default=datetime.utcnow)
 
     user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"))
     user: Mapped["User"] = relationship(back_populates="login_histories")
@@ -0,0 +1,51 @@
+import dataclasses
+import math
+import secrets
+import time
+
+from redis.asyncio import Redis
+
+from tracing import redis_span
+
+
+@dataclasses.dataclass
+class RedisSlidingWindowRepository:
+    """
+    Sliding window log: a sorted set per key with one member per admitted request, scored by its time.
+    All keys of a request are checked in one round trip, a rejected request is removed again,
+    so hammering past the limit does not push the window further.
+    """
+
+    client: Redis
+    key_prefix = "rate_limit_"
+
+    async def hit(self, limits: dict[str, int], window: int) -> int:
+        """Record a request against every `key: limit`, return 0 if admitted or seconds until it would be."""
+        now = time.time()
+        member = f"{now:.6f}:{secrets.token_hex(4)}"
+        keys = [self.key_prefix + key for key in limits]
+
+        pipe = await self.client.pipeline()
+        for key in keys:
+            pipe.zremrangebyscore(key, 0, now - window)
+            pipe.zadd(key, {member: now})
+            pipe.zcard(key)
+            pipe.zrange(key, 0, 0, withscores=True)
+            pipe.expire(key, window)
+        with redis_span("ZADD", keys=len(keys)):
+            results = await pipe.execute()
+
+        retry_after = 0.0
+        for index, limit in enumerate(limits.values()):
+            _, _, count, oldest, _ = results[index * 5 : index * 5 + 5]
+            if count > limit:
+                # the oldest admitted request leaves the window first
+                retry_after = max(retry_after, oldest[0][1] + window - now)
+
+        if retry_after:
+            with redis_span("ZREM", keys=len(keys)):
+                pipe = await self.client.pipeline()
+                for key in keys:
+                    pipe.zrem(key, member)
+                await pipe.execute()
+        return math.ceil(retry_after)
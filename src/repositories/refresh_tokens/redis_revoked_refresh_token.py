@@ -2,25 +2,44 @@ import dataclasses
 
 from redis.asyncio import Redis
 
+from repositories.refresh_tokens.revocation_cache import RevocationCache
 from settings import settings
+from tracing import redis_span
 
 
 @dataclasses.dataclass
 class RedisRevokedRefreshTokenRepository:
     client: Redis
-    key_prefix = "revoked_refresh_token_"
+    cache: RevocationCache | None = None
+    key_prefix = RevocationCache.revoked_key_prefix
     ttl = settings.token.access_token_expire_minutes * 60
 
     async def save(self, jti: str):
-        # we need refresh jti in redis only while related to it access token is alive
-        await self.client.set(self.key_prefix + jti, "", self.ttl)
+        await self.bulk_save([jti])
 
     async def bulk_save(self, jti_list: list[str]) -> None:
+        # we need refresh jti in redis only while related to it access token is alive
         pipe = await self.client.pipeline()
         for jti in jti_list:
             pipe.set(self.key_prefix + jti, "", self.ttl)
-        await pipe.execute(True)
+        pipe.publish(RevocationCache.channel, RevocationCache.revoked_message(jti_list, self.ttl))
+        with redis_span("SET PUBLISH", keys=len(jti_list)):
+            await pipe.execute(True)
+        if self.cache is not None:
+            self.cache.add_revoked(jti_list, self.ttl)
 
     async def exist(self, jti: str):
-        value = await self.client.get(self.key_prefix + jti)
+        if self.cache is not None and self.cache.ready:
+            return self.cache.is_revoked(jti)
+        with redis_span("GET"):
+            value = await self.client.get(self.key_prefix + jti)
         return value is not None
+
+    async def exist_many(self, jti_list: list[str]) -> list[bool]:
+        if self.cache is not None and self.cache.ready:
+            return [self.cache.is_revoked(jti) for jti in jti_list]
+        if not jti_list:
+            return []
+        with redis_span("MGET", keys=len(jti_list)):
+            values = await self.client.mget([self.key_prefix + jti for jti in jti_list])
+        return [value is not None for value in values]
@@ -0,0 +1,43 @@
+import dataclasses
+
+from redis.asyncio import Redis
+
+from repositories.refresh_tokens.revocation_cache import RevocationCache
+from settings import settings
+from tracing import redis_span
+
+
+@dataclasses.dataclass
+class RedisTokensEpochRepository:
+    """Per-user timestamp, tokens issued at or before it are revoked."""
+
+    client: Redis
+    cache: RevocationCache | None = None
+    key_prefix = RevocationCache.epoch_key_prefix
+    # every token issued before the epoch has expired after the longest token lifetime
+    ttl = max(settings.token.refresh_token_expire_minutes, settings.token.access_token_expire_minutes) * 60
+
+    async def save(self, user_id: str, epoch: float) -> None:
+        pipe = await self.client.pipeline()
+        pipe.set(self.key_prefix + user_id, epoch, self.ttl)
+        pipe.publish(RevocationCache.channel, RevocationCache.epoch_message(user_id, epoch, self.ttl))
+        with redis_span("SET PUBLISH"):
+            await pipe.execute(True)
+        if self.cache is not None:
+            self.cache.set_epoch(user_id, epoch, self.ttl)
+
+    async def get(self, user_id: str) -> float | None:
+        if self.cache is not None and self.cache.ready:
+            return self.cache.get_epoch(user_id)
+        with redis_span("GET"):
+            value = await self.client.get(self.key_prefix + user_id)
+        return float(value) if value is not None else None
+
+    async def get_many(self, user_ids: list[str]) -> list[float | None]:
+        if self.cache is not None and self.cache.ready:
+            return [self.cache.get_epoch(user_id) for user_id in user_ids]
+        if not user_ids:
+            return []
+        with redis_span("MGET", keys=len(user_ids)):
+            values = await self.client.mget([self.key_prefix + user_id for user_id in user_ids])
+        return [float(value) if value is not None else None for value in values]
@@ -0,0 +1,141 @@
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Optional
+
+from redis.asyncio import Redis
+
+logger = logging.getLogger(__name__)
+
+
+class RevocationCache:
+    """
+    Per-worker copy of revoked refresh token jtis and user token epochs.
+    Writers publish every change to `channel`; the cache listens to it and reloads
+    everything from Redis each time it (re)subscribes. Until the first load completes,
+    or while the subscription is down, `ready` is False and readers must ask Redis.
+    """
+
+    channel = "revocations"
+    revoked_key_prefix = "revoked_refresh_token_"
+    epoch_key_prefix = "tokens_epoch_"
+
+    def __init__(self, client: Redis, retry_interval: float = 1.0, prune_interval: float = 60.0):
+        self.client = client
+        self.retry_interval = retry_interval
+        self.prune_interval = prune_interval
+        self.ready = False
+        # values are monotonic deadlines mirroring the Redis key ttl
+        self._revoked: dict[str, float] = {}
+        self._epochs: dict[str, tuple[float, float]] = {}
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        self.ready = False
+
+    def is_revoked(self, jti: str) -> bool:
+        deadline = self._revoked.get(jti)
+        return deadline is not None and deadline > time.monotonic()
+
+    def get_epoch(self, user_id: str) -> float | None:
+        entry = self._epochs.get(user_id)
+        if entry is None or entry[1] <= time.monotonic():
+            return None
+        return entry[0]
+
+    def add_revoked(self, jti_list: list[str], ttl: float) -> None:
+        deadline = time.monotonic() + ttl
+        for jti in jti_list:
+            self._revoked[jti] = deadline
+
+    def set_epoch(self, user_id: str, epoch: float, ttl: float) -> None:
+        self._epochs[user_id] = (epoch, time.monotonic() + ttl)
+
+    @classmethod
+    def revoked_message(cls, jti_list: list[str], ttl: float) -> str:
+        return json.dumps({"type": "revoked", "jtis": jti_list, "ttl": ttl})
+
+    @classmethod
+    def epoch_message(cls, user_id: str, epoch: float, ttl: float) -> str:
+        return json.dumps({"type": "epoch", "user_id": user_id, "epoch": epoch, "ttl": ttl})
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._listen()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("Revocation cache lost its subscription, falling back to Redis", exc_info=True)
+            finally:
+                self.ready = False
+            await asyncio.sleep(self.retry_interval)
+
+    async def _listen(self) -> None:
+        async with self.client.pubsub() as pubsub:
+            await pubsub.subscribe(self.channel)
+            # messages published while reloading are buffered and applied right after
+            await self._resync()
+            self.ready = True
+
+            pruned_at = time.monotonic()
+            while True:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if message is not None:
+                    self._apply(json.loads(message["data"]))
+                if time.monotonic() - pruned_at > self.prune_interval:
+                    self._prune()
+                    pruned_at = time.monotonic()
+
+    async def _resync(self) -> None:
+        revoked: dict[str, float] = {}
+        epochs: dict[str, tuple[float, float]] = {}
+
+        keys = [key async for key in self.client.scan_iter(match=self.revoked_key_prefix + "*", count=1000)]
+        for key, ttl in zip(keys, await self._pttl(keys), strict=True):
+            revoked[key.decode().removeprefix(self.revoked_key_prefix)] = time.monotonic() + ttl
+
+        keys = [key async for key in self.client.scan_iter(match=self.epoch_key_prefix + "*", count=1000)]
+        if keys:
+            values = await self.client.mget(keys)
+            for key, value, ttl in zip(keys, values, await self._pttl(keys), strict=True):
+                if value is not None:
+                    epochs[key.decode().removeprefix(self.epoch_key_prefix)] = (float(value), time.monotonic() + ttl)
+
+        self._revoked = revoked
+        self._epochs = epochs
+
+    async def _pttl(self, keys: list[bytes]) -> list[float]:
+        pipe = await self.client.pipeline()
+        for key in keys:
+            pipe.pttl(key)
+        # -1 (no ttl) and -2 (already gone) become a zero ttl: the entry counts as expired at once
+        # and the next prune drops it
+        return [max(ttl, 0) / 1000 for ttl in await pipe.execute()]
+
+    def _apply(self, message: dict[str, Any]) -> None:
+        if message["type"] == "revoked":
+            self.add_revoked(message["jtis"], message["ttl"])
+        elif message["type"] == "epoch":
+            self.set_epoch(message["user_id"], message["epoch"], message["ttl"])
+
+    def _prune(self) -> None:
+        now = time.monotonic()
+        self._revoked = {jti: deadline for jti, deadline in self._revoked.items() if deadline > now}
+        self._epochs = {user_id: entry for user_id, entry in self._epochs.items() if entry[1] > now}
+
+
+cache: Optional[RevocationCache] = None
+
+
+async def get_revocation_cache() -> Optional[RevocationCache]:
+    return cache
@@ -1,16 +1,20 @@
 import dataclasses
+from datetime import datetime, timezone
 
-from sqlalchemy import func, select, update
+from sqlalchemy import delete, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from entities.tokens import RefreshToken
 from models.refresh_tokens import RefreshToken as RefreshTokenModel
+from models.users import User
+from tracing import traced_query
 
 
 @dataclasses.dataclass
 class SQLAlchemyRefreshTokenRepository:
     client: AsyncSession
 
+    @traced_query
     async def save(self, token: RefreshToken):
         db_token = RefreshTokenModel(
             id=token.jti,
@@ -22,25 +26,51 @@ class SQLAlchemyRefreshTokenRepository:
         self.client.add(db_token)
         await self.client.commit()
 
+    @traced_query
     async def delete(self, jti: str):
         stmt = update(RefreshTokenModel).where(RefreshTokenModel.id == jti).values(is_revoked=True)
         await self.client.execute(stmt)
         await self.client.commit()
 
+    @traced_query
     async def exist(self, jti: str) -> bool:
-        stmt = select(func.count()).where((RefreshTokenModel.id == jti) & (RefreshTokenModel.is_revoked == False))  # noqa: E712
+        """Check that the token is neither revoked nor issued before its user's revocation epoch."""
+        stmt = (
+            select(func.count())
+            .select_from(RefreshTokenModel)
+            .join(User, User.id == RefreshTokenModel.user_id)
+            .where(
+                (RefreshTokenModel.id == jti)
+                & (RefreshTokenModel.is_revoked == False)  # noqa: E712
+                & (User.tokens_valid_after.is_(None) | (RefreshTokenModel.issued_at > User.tokens_valid_after))
+            )
+        )
         result = await self.client.execute(stmt)
         count = result.scalar_one()
         return count > 0
 
-    async def delete_by_user_id(self, user_id: str) -> list[str]:
-        stmt = (
-            update(RefreshTokenModel)
-            .where((RefreshTokenModel.user_id == user_id) & (RefreshTokenModel.is_revoked == False))  # noqa: E712
-            .values(is_revoked=True)
-            .returning(RefreshTokenModel.id)
-        )
-        result = await self.client.execute(stmt)
-        ids = [str(i[0]) for i in result.all()]
+    @traced_query
+    async def save_user_epoch(self, user_id: str, valid_after: datetime) -> None:
+        stmt = update(User).where(User.id == user_id).values(tokens_valid_after=valid_after)
+        await self.client.execute(stmt)
         await self.client.commit()
-        return ids
+
+    @traced_query
+    async def purge(self, batch_size: int) -> int:
+        """Delete expired and revoked tokens in chunks of `batch_size` rows, return the number deleted."""
+        deleted = 0
+        while True:
+            chunk = (
+                select(RefreshTokenModel.id)
+                .where((RefreshTokenModel.expires_at < datetime.now(timezone.utc)) | RefreshTokenModel.is_revoked)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            stmt = delete(RefreshTokenModel).where(RefreshTokenModel.id.in_(chunk)).returning(RefreshTokenModel.id)
+            result = await self.client.execute(stmt)
+            chunk_size = len(result.all())
+            await self.client.commit()
+
+            deleted += chunk_size
+            if chunk_size < batch_size:
+                return deleted
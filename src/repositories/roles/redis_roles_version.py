@@ -0,0 +1,22 @@
+import dataclasses
+
+from redis.asyncio import Redis
+
+from tracing import redis_span
+
+
+@dataclasses.dataclass
+class RedisRolesVersionRepository:
+    """Counter bumped on every change of the roles table, workers reload what they derived from it when it moves."""
+
+    client: Redis
+    key = "roles_version"
+
+    async def get(self) -> int:
+        with redis_span("GET"):
+            value = await self.client.get(self.key)
+        return int(value) if value is not None else 0
+
+    async def bump(self) -> int:
+        with redis_span("INCR"):
+            return await self.client.incr(self.key)
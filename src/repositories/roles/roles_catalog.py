@@ -0,0 +1,81 @@
+import asyncio
+import dataclasses
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from models.roles import Role
+from schemas.roles import CachedRole
+
+from .redis_roles_version import RedisRolesVersionRepository
+
+
+@dataclasses.dataclass(frozen=True)
+class RolesSnapshot:
+    version: int
+    roles: tuple[CachedRole, ...]
+    by_id: dict[str, CachedRole]
+    by_title: dict[str, CachedRole]
+
+    @classmethod
+    def build(cls, roles: list[CachedRole], version: int) -> "RolesSnapshot":
+        return cls(
+            version=version,
+            roles=tuple(roles),
+            by_id={str(role.id): role for role in roles},
+            # titles are unique regardless of case
+            by_title={role.title.lower(): role for role in roles},
+        )
+
+
+class RolesCatalog:
+    """
+    Per-worker snapshot of the roles table.
+    Every change bumps the roles version in Redis; `sync` reloads the table once the version moved,
+    it runs periodically and before role writes. Until the first load `ready` is False and readers must ask Postgres.
+    """
+
+    def __init__(self, version_repo: RedisRolesVersionRepository, session_factory: async_sessionmaker[AsyncSession]):
+        self.version_repo = version_repo
+        self.session_factory = session_factory
+        self.snapshot: RolesSnapshot | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self.snapshot is not None
+
+    def all(self) -> tuple[CachedRole, ...]:
+        return self.snapshot.roles if self.snapshot is not None else ()
+
+    def get(self, id: str) -> CachedRole | None:
+        return self.snapshot.by_id.get(str(id)) if self.snapshot is not None else None
+
+    def get_by_title(self, title: str) -> CachedRole | None:
+        return self.snapshot.by_title.get(title.lower()) if self.snapshot is not None else None
+
+    async def sync(self) -> RolesSnapshot:
+        async with self._lock:
+            version = await self.version_repo.get()
+            if self.snapshot is None or self.snapshot.version != version:
+                self.snapshot = await self._load(version)
+            return self.snapshot
+
+    async def invalidate(self) -> RolesSnapshot:
+        """Announce a change of the roles table to every worker and reload this one's snapshot."""
+        await self.version_repo.bump()
+        return await self.sync()
+
+    async def _load(self, version: int) -> RolesSnapshot:
+        # the version is read before the rows: a change racing with the load moves it past, so it is loaded again
+        async with self.session_factory() as session:
+            roles = (await session.execute(select(Role))).scalars()
+            return RolesSnapshot.build([CachedRole.model_validate(role) for role in roles], version)
+
+
+catalog: Optional[RolesCatalog] = None
+
+
+async def get_roles_catalog() -> Optional[RolesCatalog]:
+    return catalog
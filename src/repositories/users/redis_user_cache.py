@@ -0,0 +1,38 @@
+import dataclasses
+
+from redis.asyncio import Redis
+
+from schemas.users import CachedUser
+from settings import settings
+
+
+@dataclasses.dataclass
+class RedisUserCacheRepository:
+    client: Redis
+    key_prefix = "user_"
+    email_key_prefix = "user_email_"
+    ttl = settings.redis.cache_expire_in_seconds
+
+    async def get(self, user_id: str) -> CachedUser | None:
+        return self._load(await self.client.get(self.key_prefix + str(user_id)))
+
+    async def get_by_email(self, email: str) -> CachedUser | None:
+        return self._load(await self.client.get(self.email_key_prefix + email.lower()))
+
+    async def save(self, user: CachedUser) -> None:
+        # the same record is stored under both lookups, so a hit costs one GET
+        value = user.model_dump_json()
+        pipe = await self.client.pipeline()
+        pipe.set(self.key_prefix + str(user.id), value, self.ttl)
+        pipe.set(self.email_key_prefix + user.email.lower(), value, self.ttl)
+        await pipe.execute()
+
+    async def delete(self, user_id: str, *emails: str) -> None:
+        keys = [self.key_prefix + str(user_id), *(self.email_key_prefix + email.lower() for email in emails)]
+        await self.client.delete(*keys)
+
+    @staticmethod
+    def _load(value: bytes | None) -> CachedUser | None:
+        if value is None:
+            return None
+        return CachedUser.model_validate_json(value)
@@ -1,7 +1,9 @@
 from fastapi import Request
 
-from schemas.users import BaseUser
+from models.roles import Permission
+from schemas.users import BaseUser, UserPrincipal
 
 
 class AuthRequest(Request):
-    custom_user: BaseUser
+    custom_user: BaseUser | UserPrincipal
+    permissions: Permission
@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+
+
+class DbPoolStats(BaseModel):
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    max_overflow: int
+    timeout: float
+    checkouts: int
+    timeouts: int
+    wait_time_total: float
+    wait_time_avg: float
+    wait_time_max: float
+
+
+class AdmissionStats(BaseModel):
+    max_in_flight: int
+    queue_timeout: float
+    max_queued: int
+    in_flight: int
+    queued: int
+    admitted: int
+    shed: int
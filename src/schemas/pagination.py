@@ -0,0 +1,33 @@
+import base64
+from datetime import datetime, timezone
+from uuid import UUID
+
+from pydantic import BaseModel, field_validator
+
+
+class Cursor(BaseModel):
+    """Position after the last row of a page, ordered by (created_at, id)."""
+
+    created_at: datetime
+    id: UUID
+
+    @field_validator("created_at")
+    @classmethod
+    def to_naive_utc(cls, created_at: datetime) -> datetime:
+        # the cursor comes from the client, timestamps in the database are naive UTC
+        if created_at.tzinfo is not None:
+            return created_at.astimezone(timezone.utc).replace(tzinfo=None)
+        return created_at
+
+    def encode(self) -> str:
+        return base64.urlsafe_b64encode(self.model_dump_json().encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, value: str) -> "Cursor":
+        padded = value + "=" * (-len(value) % 4)
+        return cls.model_validate_json(base64.urlsafe_b64decode(padded))
+
+
+class PaginationParams(BaseModel):
+    page_size: int
+    cursor: Cursor | None = None
@@ -1,14 +1,34 @@
+from datetime import datetime
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from models.roles import Permission
 
 
 class RoleCreate(BaseModel):
     title: str
     description: str | None = None
+    permissions: list[str] = Field(default_factory=list, description=f"Any of {', '.join(Permission.all().names)}")
 
     model_config = ConfigDict(from_attributes=True)
 
+    @field_validator("permissions", mode="before")
+    @classmethod
+    def permissions_from_bits(cls, value):
+        # roles rows keep the set as a bitmask
+        if isinstance(value, int):
+            return Permission(value).names
+        return value
+
+    @field_validator("permissions")
+    @classmethod
+    def known_permissions(cls, value: list[str]) -> list[str]:
+        unknown = set(value) - set(Permission.all().names)
+        if unknown:
+            raise ValueError(f"Unknown permissions: {', '.join(sorted(unknown))}")
+        return value
+
 
 class RoleUpdate(RoleCreate):
     pass
@@ -16,3 +36,15 @@ class RoleUpdate(RoleCreate):
 
 class BaseRole(RoleCreate):
     id: UUID
+
+
+class CachedRole(BaseModel):
+    """Roles row as kept in the per-worker roles snapshot."""
+
+    id: UUID
+    title: str
+    description: str | None = None
+    permissions: int
+    created_at: datetime | None = None
+
+    model_config = ConfigDict(from_attributes=True, frozen=True)
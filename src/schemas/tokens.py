@@ -1,5 +1,7 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
+from entities.tokens import AccessToken
+from services.exceptions import ErrorCode
 from settings import settings
 
 
@@ -7,3 +9,17 @@ class LoginOut(BaseModel):
     access_token: str
     refresh_token: str
     type: str = settings.token.type
+
+
+class CheckAccessBatchIn(BaseModel):
+    access_tokens: list[str] = Field(min_length=1, max_length=settings.token.check_access_batch_max_size)
+
+
+class CheckAccessResult(BaseModel):
+    valid: bool
+    claims: AccessToken | None = None
+    error: ErrorCode | None = None
+
+
+class CheckAccessBatchOut(BaseModel):
+    results: list[CheckAccessResult]
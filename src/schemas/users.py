@@ -1,7 +1,7 @@
 from datetime import datetime
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, model_validator
 
 
 class BaseUser(BaseModel):
@@ -14,6 +14,21 @@ class BaseUser(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class UserExport(BaseUser):
+    created_at: datetime
+    updated_at: datetime
+
+
+class UserPrincipal(BaseModel):
+    """Request user built from verified access token claims, without a database lookup."""
+
+    id: UUID
+    role: str
+    is_active: bool = True
+    is_verified: bool = False
+    is_superuser: bool = False
+
+
 class LoginHistory(BaseModel):
     login_date: datetime = Field(..., validation_alias="created_at")
     useragent: str
@@ -36,6 +51,27 @@ class UserCreate(UserCredentials):
     role: str = Field(default="guest")
 
 
+class UserImport(BaseModel):
+    """Row of a bulk import: a plaintext password to hash or the bcrypt hash of the source directory."""
+
+    # the id in the source directory, kept so references to the user stay valid
+    id: UUID | None = None
+    email: EmailStr
+    password: str | None = Field(default=None, min_length=8, max_length=20)
+    hashed_password: str | None = Field(default=None, max_length=1024)
+    role: str = Field(default="guest", max_length=255)
+    is_active: bool = True
+    is_verified: bool = False
+
+    model_config = ConfigDict(extra="ignore")
+
+    @model_validator(mode="after")
+    def check_password(self) -> "UserImport":
+        if (self.password is None) == (self.hashed_password is None):
+            raise ValueError("exactly one of password and hashed_password is required")
+        return self
+
+
 class UserUpdate(BaseModel):
     email: EmailStr
     is_active: bool = True
@@ -45,13 +81,24 @@ class UserUpdate(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class CachedUser(BaseModel):
+    """Compact copy of a users row kept in the read-through cache."""
+
+    id: UUID
+    email: str
+    hashed_password: str
+    is_active: bool
+    is_superuser: bool
+    is_verified: bool
+    created_at: datetime
+    role: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class CreateLoginHistory(BaseModel):
     user_id: UUID
     useragent: str | None = None
     referer: str | None = None
     remote_addr: str | None = None
-
-
-class PaginationParams(BaseModel):
-    page_number: int | None
-    page_size: int | None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -1,18 +1,29 @@
 from dataclasses import dataclass
+from typing import Any
 
 from jose import jwt
 from pydantic import ValidationError
 
 from entities.tokens import AccessToken
+from metrics import time_stage
 from repositories.refresh_tokens.redis_revoked_refresh_token import RedisRevokedRefreshTokenRepository
+from repositories.refresh_tokens.redis_tokens_epoch import RedisTokensEpochRepository
+from settings import settings
 
 from .base_tokens import BaseTokenService
-from .exceptions import InvalidTokenPayloadError, RevokedAccessTokenError
+from .exceptions import BaseTokenServiceError, InvalidTokenPayloadError, RevokedAccessTokenError
+from .token_cache import VerifiedTokenCache
+
+verified_access_tokens: VerifiedTokenCache[AccessToken] = VerifiedTokenCache(
+    maxsize=settings.token.verified_token_cache_size
+)
 
 
 @dataclass
 class AccessTokenService(BaseTokenService):
     revoked_refresh_repo: RedisRevokedRefreshTokenRepository
+    tokens_epoch_repo: RedisTokensEpochRepository
+    verified_cache: VerifiedTokenCache[AccessToken] | None = None
 
     async def generate_token(self, user_id: str, refresh_jti: str, **kwargs) -> str:
         to_encode = {
@@ -23,17 +34,63 @@ class AccessTokenService(BaseTokenService):
         return self._generate_token(to_encode)
 
     async def validate_token(self, encoded_token: str) -> AccessToken:
-        await super().validate_token(encoded_token)
+        payload = self._verify(encoded_token)
 
-        payload = self.get_payload(encoded_token)
+        with time_stage("redis_revocation"):
+            is_revoked = await self.revoked_refresh_repo.exist(payload.refresh_jti)
+            epoch = await self.tokens_epoch_repo.get(payload.sub) if not is_revoked else None
 
-        if await self.revoked_refresh_repo.exist(payload.refresh_jti):
+        if is_revoked:
+            raise RevokedAccessTokenError
+        if epoch is not None and payload.iat.timestamp() <= epoch:
             raise RevokedAccessTokenError
 
         return payload
 
+    async def validate_tokens(self, encoded_tokens: list[str]) -> list[AccessToken | BaseTokenServiceError]:
+        """
+        Validates many tokens at once, revocation state is fetched with one lookup per repository.
+        Each result is either the token payload or the error it failed with, in input order.
+        """
+        results: list[AccessToken | BaseTokenServiceError] = []
+        for encoded_token in encoded_tokens:
+            try:
+                results.append(self._verify(encoded_token))
+            except BaseTokenServiceError as e:
+                results.append(e)
+
+        payloads = [result for result in results if isinstance(result, AccessToken)]
+        user_ids = list({payload.sub for payload in payloads})
+        jti_list = [payload.refresh_jti for payload in payloads]
+        with time_stage("redis_revocation"):
+            revoked = await self.revoked_refresh_repo.exist_many(jti_list)
+            epochs = dict(zip(user_ids, await self.tokens_epoch_repo.get_many(user_ids), strict=True))
+        revoked_jtis = {jti for jti, is_revoked in zip(jti_list, revoked, strict=True) if is_revoked}
+
+        for i, result in enumerate(results):
+            if not isinstance(result, AccessToken):
+                continue
+            epoch = epochs[result.sub]
+            if result.refresh_jti in revoked_jtis or (epoch is not None and result.iat.timestamp() <= epoch):
+                results[i] = RevokedAccessTokenError()
+
+        return results
+
+    def _verify(self, encoded_token: str) -> AccessToken:
+        payload = self.verified_cache.get(encoded_token) if self.verified_cache is not None else None
+
+        if payload is None:
+            payload = self._parse_claims(self._decode_token(encoded_token))
+            if self.verified_cache is not None:
+                self.verified_cache.put(encoded_token, payload)
+
+        return payload
+
     def get_payload(self, encoded_token: str) -> AccessToken:
+        return self._parse_claims(jwt.get_unverified_claims(encoded_token))
+
+    def _parse_claims(self, claims: dict[str, Any]) -> AccessToken:
         try:
-            return AccessToken(**jwt.get_unverified_claims(encoded_token))
+            return AccessToken(**claims)
         except ValidationError as e:
             raise InvalidTokenPayloadError from e
@@ -0,0 +1,89 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional
+
+from metrics import ADMISSION_IN_FLIGHT, ADMISSION_QUEUED, ADMISSION_SHED
+from settings import AdmissionSettings
+
+from .exceptions import AdmissionRejectedError
+
+
+class AdmissionController:
+    """
+    Caps the CPU-bound requests a worker runs at once.
+    Requests over the cap wait in line up to `queue_timeout` seconds and are shed after it,
+    or right away when `max_queued` are already waiting, so the admitted ones keep their latency.
+    """
+
+    def __init__(self, max_in_flight: int, queue_timeout: float, max_queued: int):
+        self.max_in_flight = max_in_flight
+        self.queue_timeout = queue_timeout
+        self.max_queued = max_queued
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self.in_flight = 0
+        self.queued = 0
+        self.admitted = 0
+        self.shed = 0
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        if self._slots.locked() and self.queued >= self.max_queued:
+            self._shed()
+
+        self._set_queued(self.queued + 1)
+        try:
+            async with asyncio.timeout(self.queue_timeout):
+                await self._slots.acquire()
+        except TimeoutError:
+            self._shed()
+        finally:
+            self._set_queued(self.queued - 1)
+
+        self.admitted += 1
+        self._set_in_flight(self.in_flight + 1)
+        try:
+            yield
+        finally:
+            self._set_in_flight(self.in_flight - 1)
+            self._slots.release()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "max_in_flight": self.max_in_flight,
+            "queue_timeout": self.queue_timeout,
+            "max_queued": self.max_queued,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "shed": self.shed,
+        }
+
+    def _shed(self) -> None:
+        self.shed += 1
+        ADMISSION_SHED.inc()
+        raise AdmissionRejectedError
+
+    def _set_queued(self, value: int) -> None:
+        self.queued = value
+        ADMISSION_QUEUED.set(value)
+
+    def _set_in_flight(self, value: int) -> None:
+        self.in_flight = value
+        ADMISSION_IN_FLIGHT.set(value)
+
+
+def create_admission_controller(admission_settings: AdmissionSettings) -> Optional[AdmissionController]:
+    if not admission_settings.admission_control_enabled:
+        return None
+    return AdmissionController(
+        max_in_flight=admission_settings.admission_max_in_flight,
+        queue_timeout=admission_settings.admission_queue_timeout,
+        max_queued=admission_settings.admission_max_queued,
+    )
+
+
+controller: Optional[AdmissionController] = None
+
+
+async def get_admission_controller() -> Optional[AdmissionController]:
+    return controller
@@ -1,8 +1,12 @@
 import dataclasses
 
+from entities.tokens import AccessToken
 from models.users import User
+from tracing import traced
 
 from .access_tokens import AccessTokenService
+from .exceptions import BaseTokenServiceError
+from .permissions import PermissionMatrix
 from .refresh_tokens import RefreshTokenService
 from .users import UserManager
 
@@ -12,7 +16,9 @@ class AuthService:
     access_token_service: AccessTokenService
     refresh_token_service: RefreshTokenService
     user_service: UserManager
+    permission_matrix: PermissionMatrix
 
+    @traced()
     async def login(self, user: User):
         refresh_token = await self.refresh_token_service.generate_token(str(user.id))
         refresh_payload = self.refresh_token_service.get_payload(refresh_token)
@@ -22,10 +28,14 @@ class AuthService:
             is_active=user.is_active,
             is_verified=user.is_verified,
             is_superuser=user.is_superuser,
+            role=user.role,
+            perm=int(self.permission_matrix.permissions(user.role)),
+            pv=self.permission_matrix.version,
         )
 
         return refresh_token, access_token
 
+    @traced()
     async def refresh(self, refresh_token: str):
         payload = await self.refresh_token_service.validate_token(refresh_token)
         await self.refresh_token_service.revoke_token(payload.jti)
@@ -36,10 +46,14 @@ class AuthService:
     async def check_access(self, access_token: str):
         await self.access_token_service.validate_token(access_token)
 
+    async def check_access_batch(self, access_tokens: list[str]) -> list[AccessToken | BaseTokenServiceError]:
+        return await self.access_token_service.validate_tokens(access_tokens)
+
     async def logout(self, access_token: str):
         payload = await self.access_token_service.validate_token(access_token)
         await self.refresh_token_service.revoke_token(payload.refresh_jti)
 
+    @traced()
     async def logout_all(self, access_token: str):
         payload = await self.access_token_service.validate_token(access_token)
         await self.refresh_token_service.revoke_user_tokens(payload.sub)
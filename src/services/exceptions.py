@@ -8,6 +8,10 @@ class ErrorCode(str, Enum):
     NOT_VALIDATE_CREDENTIALS = "COULD NOT VALIDATE CREDENTIALS"
     INACTIVE_USER = "INACTIVE USER"
     IS_NOT_SUPERUSER = "IS NOT SUPERUSER"
+    INVALID_CURSOR = "INVALID_CURSOR"
+    TOO_MANY_REQUESTS = "TOO_MANY_REQUESTS"
+    SERVICE_OVERLOADED = "SERVICE_OVERLOADED"
+    ROLE_ALREADY_EXISTS = "ROLE_ALREADY_EXISTS"
 
     INVALID_TOKEN_SIGNATURE = "INVALID_TOKEN_SIGNATURE"  # noqa: S105
     TOKEN_EXPIRED = "TOKEN_EXPIRED"  # noqa: S105
@@ -78,3 +82,13 @@ class RoleNotExistsError(RolesError):
 
 class RoleAlreadyExistsError(RolesError):
     pass
+
+
+class RateLimitExceededError(Exception):
+    def __init__(self, retry_after: int):
+        super().__init__(retry_after)
+        self.retry_after = retry_after
+
+
+class AdmissionRejectedError(Exception):
+    pass
@@ -0,0 +1,244 @@
+import base64
+import hashlib
+import hmac
+import json
+import time
+from abc import ABC, abstractmethod
+from calendar import timegm
+from datetime import datetime
+from typing import Any
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, padding, rsa
+from cryptography.hazmat.primitives.asymmetric.utils import decode_dss_signature, encode_dss_signature
+from jose import ExpiredSignatureError, JWTError, jwk, jwt
+from jose.exceptions import JWTClaimsError
+
+from .exceptions import ExpiredTokenError, InvalidTokenSignatureError
+
+HMAC_ALGORITHMS = {"HS256", "HS384", "HS512"}
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _int_to_b64(value: int, length: int | None = None) -> str:
+    length = length or (value.bit_length() + 7) // 8
+    return _b64encode(value.to_bytes(length, "big"))
+
+
+def _prepare_claims(claims: dict[str, Any]) -> dict[str, Any]:
+    # same NumericDate conversion python-jose does for the registered time claims
+    return {
+        name: timegm(value.utctimetuple()) if name in ("exp", "iat", "nbf") and isinstance(value, datetime) else value
+        for name, value in claims.items()
+    }
+
+
+class JWTEngine(ABC):
+    """
+    Signs and verifies JWTs with keys parsed once by `load_*_key`.
+    Errors are reported as token service exceptions.
+    """
+
+    algorithms: frozenset[str]
+
+    @abstractmethod
+    def load_private_key(self, key_data: str, algorithm: str) -> Any: ...
+
+    @abstractmethod
+    def load_public_key(self, key_data: str, algorithm: str) -> Any: ...
+
+    @abstractmethod
+    def public_key(self, private_key: Any, algorithm: str) -> Any: ...
+
+    @abstractmethod
+    def public_jwk(self, public_key: Any, algorithm: str) -> dict[str, Any]: ...
+
+    @abstractmethod
+    def encode(self, claims: dict[str, Any], private_key: Any, algorithm: str, headers: dict[str, Any]) -> str: ...
+
+    @abstractmethod
+    def decode(self, encoded_token: str, public_key: Any, algorithm: str) -> dict[str, Any]:
+        """Verify signature and registered claims in a single pass and return the claims."""
+
+    @abstractmethod
+    def get_unverified_header(self, encoded_token: str) -> dict[str, Any]: ...
+
+
+class JoseEngine(JWTEngine):
+    algorithms = frozenset({"HS256", "HS384", "HS512", "RS256", "RS384", "RS512", "ES256", "ES384", "ES512"})
+
+    def load_private_key(self, key_data: str, algorithm: str) -> Any:
+        return jwk.construct(key_data, algorithm)
+
+    def load_public_key(self, key_data: str, algorithm: str) -> Any:
+        return jwk.construct(key_data, algorithm)
+
+    def public_key(self, private_key: Any, algorithm: str) -> Any:
+        return private_key if algorithm in HMAC_ALGORITHMS else private_key.public_key()
+
+    def public_jwk(self, public_key: Any, algorithm: str) -> dict[str, Any]:
+        return public_key.to_dict()
+
+    def encode(self, claims: dict[str, Any], private_key: Any, algorithm: str, headers: dict[str, Any]) -> str:
+        return jwt.encode(claims, private_key, algorithm=algorithm, headers=headers)
+
+    def decode(self, encoded_token: str, public_key: Any, algorithm: str) -> dict[str, Any]:
+        try:
+            return jwt.decode(encoded_token, public_key, algorithm)
+        except (ExpiredSignatureError, JWTClaimsError) as e:
+            raise ExpiredTokenError from e
+        except JWTError as e:
+            raise InvalidTokenSignatureError from e
+
+    def get_unverified_header(self, encoded_token: str) -> dict[str, Any]:
+        try:
+            return jwt.get_unverified_header(encoded_token)
+        except JWTError as e:
+            raise InvalidTokenSignatureError from e
+
+
+class CryptographyEngine(JWTEngine):
+    """Calls `cryptography` directly, adds EdDSA (Ed25519) which python-jose lacks."""
+
+    algorithms = frozenset({"HS256", "RS256", "ES256", "EdDSA"})
+
+    def load_private_key(self, key_data: str, algorithm: str) -> Any:
+        if algorithm in HMAC_ALGORITHMS:
+            return key_data.encode()
+        return self._check_key_type(serialization.load_pem_private_key(key_data.encode(), password=None), algorithm)
+
+    def load_public_key(self, key_data: str, algorithm: str) -> Any:
+        if algorithm in HMAC_ALGORITHMS:
+            return key_data.encode()
+        return self._check_key_type(serialization.load_pem_public_key(key_data.encode()), algorithm)
+
+    def public_key(self, private_key: Any, algorithm: str) -> Any:
+        return private_key if algorithm in HMAC_ALGORITHMS else private_key.public_key()
+
+    def public_jwk(self, public_key: Any, algorithm: str) -> dict[str, Any]:
+        if isinstance(public_key, bytes):
+            return {"kty": "oct", "k": _b64encode(public_key)}
+        if isinstance(public_key, rsa.RSAPublicKey):
+            numbers = public_key.public_numbers()
+            return {"kty": "RSA", "n": _int_to_b64(numbers.n), "e": _int_to_b64(numbers.e)}
+        if isinstance(public_key, ec.EllipticCurvePublicKey):
+            ec_numbers = public_key.public_numbers()
+            size = (public_key.curve.key_size + 7) // 8
+            return {
+                "kty": "EC",
+                "crv": "P-256",
+                "x": _int_to_b64(ec_numbers.x, size),
+                "y": _int_to_b64(ec_numbers.y, size),
+            }
+        raw = public_key.public_bytes(serialization.Encoding.Raw, serialization.PublicFormat.Raw)
+        return {"kty": "OKP", "crv": "Ed25519", "x": _b64encode(raw)}
+
+    def encode(self, claims: dict[str, Any], private_key: Any, algorithm: str, headers: dict[str, Any]) -> str:
+        header = {"alg": algorithm, "typ": "JWT", **headers}
+        signing_input = ".".join(
+            _b64encode(json.dumps(part, separators=(",", ":")).encode()) for part in (header, _prepare_claims(claims))
+        )
+        signature = self._sign(signing_input.encode(), private_key, algorithm)
+        return signing_input + "." + _b64encode(signature)
+
+    def decode(self, encoded_token: str, public_key: Any, algorithm: str) -> dict[str, Any]:
+        try:
+            signing_input, encoded_signature = encoded_token.rsplit(".", 1)
+            encoded_header, encoded_claims = signing_input.split(".")
+            header = json.loads(_b64decode(encoded_header))
+            signature = _b64decode(encoded_signature)
+            claims = json.loads(_b64decode(encoded_claims))
+        except ValueError as e:
+            raise InvalidTokenSignatureError from e
+
+        if not isinstance(header, dict) or header.get("alg") != algorithm or not isinstance(claims, dict):
+            raise InvalidTokenSignatureError
+        if not self._verify(signing_input.encode(), signature, public_key, algorithm):
+            raise InvalidTokenSignatureError
+
+        self._validate_time_claims(claims)
+        return claims
+
+    def get_unverified_header(self, encoded_token: str) -> dict[str, Any]:
+        try:
+            header = json.loads(_b64decode(encoded_token.split(".", 1)[0]))
+        except ValueError as e:
+            raise InvalidTokenSignatureError from e
+        if not isinstance(header, dict):
+            raise InvalidTokenSignatureError
+        return header
+
+    @staticmethod
+    def _check_key_type(key: Any, algorithm: str) -> Any:
+        key_types: dict[str, tuple[type, ...]] = {
+            "RS256": (rsa.RSAPrivateKey, rsa.RSAPublicKey),
+            "ES256": (ec.EllipticCurvePrivateKey, ec.EllipticCurvePublicKey),
+            "EdDSA": (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey),
+        }
+        if isinstance(key, ec.EllipticCurvePrivateKey | ec.EllipticCurvePublicKey) and key.curve.name != "secp256r1":
+            raise ValueError("ES256 requires a P-256 key")
+        if algorithm not in key_types or not isinstance(key, key_types[algorithm]):
+            raise ValueError(f"Key does not match the {algorithm} algorithm")
+        return key
+
+    @staticmethod
+    def _sign(data: bytes, private_key: Any, algorithm: str) -> bytes:
+        if algorithm == "HS256":
+            return hmac.new(private_key, data, hashlib.sha256).digest()
+        if algorithm == "RS256":
+            return private_key.sign(data, padding.PKCS1v15(), hashes.SHA256())
+        if algorithm == "ES256":
+            # JWS uses the fixed-size r || s form instead of DER
+            r, s = decode_dss_signature(private_key.sign(data, ec.ECDSA(hashes.SHA256())))
+            return r.to_bytes(32, "big") + s.to_bytes(32, "big")
+        return private_key.sign(data)
+
+    @staticmethod
+    def _verify(data: bytes, signature: bytes, public_key: Any, algorithm: str) -> bool:
+        if algorithm == "HS256":
+            return hmac.compare_digest(hmac.new(public_key, data, hashlib.sha256).digest(), signature)
+        try:
+            if algorithm == "RS256":
+                public_key.verify(signature, data, padding.PKCS1v15(), hashes.SHA256())
+            elif algorithm == "ES256":
+                if len(signature) != 64:
+                    return False
+                der = encode_dss_signature(int.from_bytes(signature[:32], "big"), int.from_bytes(signature[32:], "big"))
+                public_key.verify(der, data, ec.ECDSA(hashes.SHA256()))
+            else:
+                public_key.verify(signature, data)
+        except InvalidSignature:
+            return False
+        return True
+
+    @staticmethod
+    def _validate_time_claims(claims: dict[str, Any]) -> None:
+        now = time.time()
+        for name in ("exp", "iat", "nbf"):
+            if name in claims and not isinstance(claims[name], int | float):
+                raise ExpiredTokenError
+        if "exp" in claims and claims["exp"] < now:
+            raise ExpiredTokenError
+        if "nbf" in claims and claims["nbf"] > now:
+            raise ExpiredTokenError
+
+
+ENGINES: dict[str, type[JWTEngine]] = {
+    "jose": JoseEngine,
+    "cryptography": CryptographyEngine,
+}
+
+
+def create_jwt_engine(name: str, algorithm: str) -> JWTEngine:
+    engine = ENGINES[name]()
+    if algorithm not in engine.algorithms:
+        raise ValueError(f"JWT engine {name!r} does not support {algorithm}")
+    return engine
@@ -0,0 +1,136 @@
+import base64
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+from settings import TokenSettings, settings
+
+from .exceptions import InvalidTokenSignatureError
+from .jwt_engines import HMAC_ALGORITHMS, JWTEngine, create_jwt_engine
+
+# RFC 7638: members that make up the thumbprint of each key type
+THUMBPRINT_MEMBERS = {
+    "RSA": ("e", "kty", "n"),
+    "EC": ("crv", "kty", "x", "y"),
+    "OKP": ("crv", "kty", "x"),
+    "oct": ("k", "kty"),
+}
+EC_ALGORITHMS = {256: "ES256", 384: "ES384", 521: "ES512"}
+
+
+def jwk_thumbprint(public_jwk: dict[str, Any]) -> str:
+    members = {name: public_jwk[name] for name in THUMBPRINT_MEMBERS[public_jwk["kty"]]}
+    digest = hashlib.sha256(json.dumps(members, sort_keys=True, separators=(",", ":")).encode()).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+
+def public_key_algorithm(key_data: str, default: str) -> str:
+    """Algorithm for a PEM public key, so keys of a previous algorithm stay verifiable after switching."""
+    try:
+        key = serialization.load_pem_public_key(key_data.encode())
+    except ValueError:
+        return default
+
+    if isinstance(key, rsa.RSAPublicKey):
+        return default if default.startswith("RS") else "RS256"
+    if isinstance(key, ec.EllipticCurvePublicKey):
+        return EC_ALGORITHMS.get(key.curve.key_size, default)
+    if isinstance(key, ed25519.Ed25519PublicKey):
+        return "EdDSA"
+    return default
+
+
+@dataclass(frozen=True)
+class TokenKey:
+    kid: str
+    algorithm: str
+    verifying_key: Any
+    public_jwk: dict[str, Any]
+
+    @property
+    def is_symmetric(self) -> bool:
+        return self.algorithm in HMAC_ALGORITHMS
+
+
+class KeyRing:
+    """
+    Parsed token keys, looked up by the `kid` token header.
+    Tokens without a `kid` were issued before key ids existed and are checked with the current key.
+    Only the current key signs, the others are kept for verification.
+    """
+
+    def __init__(self, engine: JWTEngine, current: TokenKey, signing_key: Any, others: list[TokenKey]):
+        self.engine = engine
+        self.current = current
+        self.signing_key = signing_key
+        self._keys = {key.kid: key for key in others}
+        self._keys[current.kid] = current
+        public_keys = [
+            {**key.public_jwk, "kid": key.kid, "alg": key.algorithm, "use": "sig"}
+            for key in self._keys.values()
+            if not key.is_symmetric
+        ]
+        self.jwks = json.dumps({"keys": public_keys}, separators=(",", ":")).encode()
+        self.jwks_etag = '"' + hashlib.sha256(self.jwks).hexdigest()[:32] + '"'
+
+    def get(self, kid: str | None) -> TokenKey | None:
+        if kid is None:
+            return self.current
+        return self._keys.get(kid)
+
+    def encode(self, claims: dict[str, Any]) -> str:
+        return self.engine.encode(claims, self.signing_key, self.current.algorithm, {"kid": self.current.kid})
+
+    def decode(self, encoded_token: str) -> dict[str, Any]:
+        header = self.engine.get_unverified_header(encoded_token)
+        # the header is not verified yet, a `kid` of any other type is a forged token
+        if not isinstance(header, dict) or not isinstance(header.get("kid"), str | None):
+            raise InvalidTokenSignatureError
+        key = self.get(header.get("kid"))
+        if key is None:
+            raise InvalidTokenSignatureError
+        return self.engine.decode(encoded_token, key.verifying_key, key.algorithm)
+
+
+def _token_key(engine: JWTEngine, verifying_key: Any, algorithm: str, kid: str | None = None) -> TokenKey:
+    public_jwk = engine.public_jwk(verifying_key, algorithm)
+    return TokenKey(
+        kid=kid or jwk_thumbprint(public_jwk),
+        algorithm=algorithm,
+        verifying_key=verifying_key,
+        public_jwk=public_jwk,
+    )
+
+
+def load_key_ring(token_settings: TokenSettings) -> KeyRing:
+    algorithm = token_settings.algorithm
+    engine = create_jwt_engine(token_settings.jwt_engine, algorithm)
+    signing_key = engine.load_private_key(token_settings.secret_key, algorithm)
+
+    if token_settings.public_key is not None and algorithm not in HMAC_ALGORITHMS:
+        verifying_key = engine.load_public_key(token_settings.public_key, algorithm)
+    else:
+        verifying_key = engine.public_key(signing_key, algorithm)
+
+    current = _token_key(engine, verifying_key, algorithm, token_settings.key_id)
+    others = []
+    for key_data in token_settings.additional_public_keys:
+        key_algorithm = public_key_algorithm(key_data, algorithm)
+        if key_algorithm not in engine.algorithms:
+            raise ValueError(f"JWT engine {token_settings.jwt_engine!r} does not support {key_algorithm}")
+        others.append(_token_key(engine, engine.load_public_key(key_data, key_algorithm), key_algorithm))
+    return KeyRing(engine, current, signing_key, others)
+
+
+key_ring: Optional[KeyRing] = None
+
+
+def get_key_ring() -> KeyRing:
+    global key_ring
+    if key_ring is None:
+        key_ring = load_key_ring(settings.token)
+    return key_ring
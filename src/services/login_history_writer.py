@@ -0,0 +1,148 @@
+import asyncio
+import logging
+from typing import Any, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from metrics import time_stage
+from models.users import LoginHistory
+from settings import LoginHistorySettings
+
+logger = logging.getLogger(__name__)
+
+
+class LoginHistoryWriter:
+    """
+    Buffers login history records and writes them with multi-row inserts from a background task.
+    A batch is flushed when it reaches `batch_size` or `flush_interval` seconds after its first record.
+    A batch that fails to write is retried up to `max_retries` times with exponential backoff
+    starting at `retry_interval` seconds. `put` waits while the queue is full.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        batch_size: int,
+        flush_interval: float,
+        queue_size: int,
+        max_retries: int = 5,
+        retry_interval: float = 1.0,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.retry_interval = retry_interval
+        self.queue: asyncio.Queue[dict[str, Any] | None] = asyncio.Queue(maxsize=queue_size)
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Flush everything queued so far and stop the background task."""
+        if self._task is None:
+            return
+        await self.queue.put(None)
+        await self._task
+        self._task = None
+
+    async def put(self, history: dict[str, Any]) -> None:
+        await self.queue.put(history)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            first = await self.queue.get()
+            if first is None:
+                break
+
+            batch = [first]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    history = await asyncio.wait_for(self.queue.get(), deadline - loop.time())
+                except TimeoutError:
+                    break
+                if history is None:
+                    stopping = True
+                    break
+                batch.append(history)
+
+            await self._flush(batch)
+
+    async def _flush(self, batch: list[dict[str, Any]]) -> None:
+        attempt = 0
+        while True:
+            try:
+                with time_stage("login_history_flush"):
+                    await self._write(batch)
+                return
+            except Exception:
+                attempt += 1
+                if attempt > self.max_retries:
+                    logger.exception("Dropped %d login history records after %d attempts", len(batch), attempt)
+                    return
+                delay = self.retry_interval * 2 ** (attempt - 1)
+                logger.warning(
+                    "Failed to write %d login history records, retrying in %.1fs", len(batch), delay, exc_info=True
+                )
+                await asyncio.sleep(delay)
+
+    async def _write(self, batch: list[dict[str, Any]]) -> None:
+        try:
+            async with self.session_factory() as session:
+                await session.execute(insert(LoginHistory), batch)
+                await session.commit()
+        except IntegrityError:
+            # a single rejected row fails the whole insert, write the batch row by row to keep the rest
+            await self._write_each(batch)
+
+    async def _write_each(self, batch: list[dict[str, Any]]) -> None:
+        """Insert rows one at a time. Written and rejected rows leave `batch`, so a retry resumes after them."""
+        done = deleted_users = rejected = 0
+        cause: BaseException | None = None
+        try:
+            async with self.session_factory() as session:
+                for history in batch:
+                    try:
+                        await session.execute(insert(LoginHistory), history)
+                        await session.commit()
+                    except IntegrityError as e:
+                        await session.rollback()
+                        # foreign_key_violation: the user was deleted after logging in
+                        if getattr(e.orig, "sqlstate", None) == "23503":
+                            deleted_users += 1
+                        else:
+                            rejected += 1
+                            cause = e.orig
+                    done += 1
+        finally:
+            del batch[:done]
+            if deleted_users:
+                logger.warning("Dropped %d login history records of deleted users", deleted_users)
+            if rejected:
+                logger.error("Dropped %d login history records rejected by the database: %s", rejected, cause)
+
+
+def create_login_history_writer(
+    session_factory: async_sessionmaker[AsyncSession], history_settings: LoginHistorySettings
+) -> LoginHistoryWriter:
+    return LoginHistoryWriter(
+        session_factory=session_factory,
+        batch_size=history_settings.login_history_batch_size,
+        flush_interval=history_settings.login_history_flush_interval,
+        queue_size=history_settings.login_history_queue_size,
+        max_retries=history_settings.login_history_max_retries,
+        retry_interval=history_settings.login_history_retry_interval,
+    )
+
+
+writer: Optional[LoginHistoryWriter] = None
+
+
+async def get_login_history_writer() -> Optional[LoginHistoryWriter]:
+    return writer
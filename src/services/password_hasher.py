@@ -0,0 +1,102 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from passlib.context import CryptContext
+
+from settings import HashingSettings, settings
+
+from .exceptions import AdmissionRejectedError
+
+T = TypeVar("T")
+
+context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def hash_password(password: str) -> str:
+    return context.hash(password)
+
+
+def hash_passwords(passwords: list[str]) -> list[str]:
+    return [context.hash(password) for password in passwords]
+
+
+def is_password_hash(hashed_password: str) -> bool:
+    return context.identify(hashed_password, required=False) is not None
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    return context.verify_and_update(plain_password, hashed_password)
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt in an executor so hashing never blocks the event loop.
+    At most `max_pending` jobs are handed to the executor at once, the rest wait on the loop;
+    once `max_queued` are waiting further jobs are rejected right away (None waits without bound).
+    """
+
+    def __init__(self, executor: Executor | None, max_pending: int, max_queued: int | None = None):
+        self.executor = executor
+        self.max_queued = max_queued
+        self.queued = 0
+        self._slots = asyncio.Semaphore(max_pending)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def hash_many(self, passwords: list[str], chunk_size: int = 64) -> list[str]:
+        """Hash a batch of passwords, `chunk_size` per executor job to keep the pickling overhead low."""
+        chunks = [passwords[i : i + chunk_size] for i in range(0, len(passwords), chunk_size)]
+        hashed_chunks = await asyncio.gather(*(self._run(hash_passwords, chunk) for chunk in chunks))
+        return [hashed_password for hashed_chunk in hashed_chunks for hashed_password in hashed_chunk]
+
+    async def verify_and_update(self, plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+        return await self._run(verify_and_update_password, plain_password, hashed_password)
+
+    async def shutdown(self) -> None:
+        if self.executor is not None:
+            # waiting for the workers to exit blocks, keep it off the event loop
+            await asyncio.to_thread(self.executor.shutdown, wait=True, cancel_futures=True)
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        if self._slots.locked() and self.max_queued is not None and self.queued >= self.max_queued:
+            raise AdmissionRejectedError
+        self.queued += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.queued -= 1
+
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, func, *args)
+        finally:
+            self._slots.release()
+
+
+def create_password_hasher(hash_settings: HashingSettings) -> PasswordHasher:
+    executor: Executor
+    if hash_settings.hashing_executor == "process":
+        # spawn keeps workers free of the parent's event loop and open connections
+        executor = ProcessPoolExecutor(
+            max_workers=hash_settings.hashing_workers, mp_context=multiprocessing.get_context("spawn")
+        )
+    else:
+        executor = ThreadPoolExecutor(max_workers=hash_settings.hashing_workers)
+
+    return PasswordHasher(
+        executor=executor, max_pending=hash_settings.hashing_max_pending, max_queued=hash_settings.hashing_max_queued
+    )
+
+
+hasher: Optional[PasswordHasher] = None
+
+
+def get_password_hasher() -> PasswordHasher:
+    global hasher
+    if hasher is None:
+        # no pool configured (e.g. CLI): fall back to the loop's default thread pool
+        hasher = PasswordHasher(executor=None, max_pending=settings.hashing.hashing_max_pending)
+    return hasher
@@ -0,0 +1,63 @@
+from typing import Iterable, Optional
+
+from entities.tokens import AccessToken
+from models.roles import Permission
+from models.users import UserRoles
+from repositories.roles import roles_catalog
+from schemas.roles import CachedRole
+
+user_roles = UserRoles()
+
+# roles every deployment has, whether or not they have a row in the roles table
+BUILTIN_ROLE_PERMISSIONS = {
+    user_roles.superuser: Permission.all(),
+    user_roles.admin: Permission.all(),
+}
+
+
+class PermissionMatrix:
+    """
+    Permission set of every role, compiled from the roles snapshot at roles version `version`.
+    Access tokens carry the set of their role (`perm`) and the version it was read at (`pv`).
+    """
+
+    def __init__(self, roles: dict[str, Permission], version: int):
+        self._roles = roles
+        self.version = version
+
+    def permissions(self, role: str | None) -> Permission:
+        if role is None:
+            return Permission(0)
+        # role titles are unique regardless of case, users.role may differ from the title in case
+        return self._roles.get(role.lower(), Permission(0))
+
+    def resolve(self, role: str, token: AccessToken) -> Permission:
+        """Permissions of a request user with the given current role, authenticated by `token`."""
+        # the claim holds while neither the roles nor the user's role changed since the token was issued
+        if token.perm is not None and token.pv == self.version and token.role == role:
+            return Permission(token.perm)
+        return self.permissions(role)
+
+
+def compile_permission_matrix(roles: Iterable[CachedRole], version: int) -> PermissionMatrix:
+    matrix = dict(BUILTIN_ROLE_PERMISSIONS)
+    for role in roles:
+        title = role.title.lower()
+        matrix[title] = matrix.get(title, Permission(0)) | Permission(role.permissions)
+    return PermissionMatrix(matrix, version)
+
+
+matrix: Optional[PermissionMatrix] = None
+
+
+def get_permission_matrix() -> PermissionMatrix:
+    """Matrix of the current roles snapshot, recompiled when the snapshot moved to another version."""
+    global matrix
+    catalog = roles_catalog.catalog
+    if catalog is None or catalog.snapshot is None:
+        # no catalog (e.g. CLI): built-in roles only, and a version no token claim matches
+        return compile_permission_matrix((), version=-1)
+    snapshot = catalog.snapshot
+    if matrix is None or matrix.version != snapshot.version:
+        matrix = compile_permission_matrix(snapshot.roles, snapshot.version)
+    return matrix
@@ -0,0 +1,45 @@
+import dataclasses
+from typing import Annotated
+
+from fastapi import Depends
+from redis.asyncio import Redis
+
+from db.redis_db import get_redis
+from metrics import RATE_LIMITED
+from repositories.rate_limits.redis_sliding_window import RedisSlidingWindowRepository
+from services import exceptions
+from settings import RateLimitSettings, settings
+
+
+@dataclasses.dataclass
+class RateLimitService:
+    """Turns away login and register bursts before they reach bcrypt."""
+
+    repo: RedisSlidingWindowRepository
+    limits: RateLimitSettings
+
+    async def check_login(self, remote_addr: str, email: str) -> None:
+        await self._check(
+            "login",
+            {
+                f"login_ip_{remote_addr}": self.limits.login_rate_limit_per_ip,
+                f"login_email_{email.lower()}": self.limits.login_rate_limit_per_email,
+            },
+        )
+
+    async def check_register(self, remote_addr: str) -> None:
+        await self._check("register", {f"register_ip_{remote_addr}": self.limits.register_rate_limit_per_ip})
+
+    async def _check(self, action: str, limits: dict[str, int]) -> None:
+        retry_after = await self.repo.hit(limits, self.limits.rate_limit_window)
+        if retry_after:
+            RATE_LIMITED.labels(action).inc()
+            raise exceptions.RateLimitExceededError(retry_after)
+
+
+async def get_rate_limit_service(
+    redis_client: Annotated[Redis, Depends(get_redis)],
+) -> RateLimitService | None:
+    if not settings.rate_limit.rate_limit_enabled:
+        return None
+    return RateLimitService(repo=RedisSlidingWindowRepository(client=redis_client), limits=settings.rate_limit)
@@ -1,11 +1,16 @@
 from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
 
 from jose import jwt
 from pydantic import ValidationError
 
+from db import postgres
 from entities.tokens import RefreshToken
 from repositories.refresh_tokens.redis_revoked_refresh_token import RedisRevokedRefreshTokenRepository
+from repositories.refresh_tokens.redis_tokens_epoch import RedisTokensEpochRepository
 from repositories.refresh_tokens.sqlalchemy_refresh_token import SQLAlchemyRefreshTokenRepository
+from settings import settings
 
 from .base_tokens import BaseTokenService
 from .exceptions import InvalidTokenPayloadError, RevokedRefreshTokenError
@@ -15,6 +20,7 @@ from .exceptions import InvalidTokenPayloadError, RevokedRefreshTokenError
 class RefreshTokenService(BaseTokenService):
     repo: SQLAlchemyRefreshTokenRepository
     revoked_repo: RedisRevokedRefreshTokenRepository
+    tokens_epoch_repo: RedisTokensEpochRepository
 
     async def generate_token(self, user_id: str) -> str:
         to_encode = {"sub": user_id}
@@ -24,9 +30,7 @@ class RefreshTokenService(BaseTokenService):
         return encoded_token
 
     async def validate_token(self, encoded_token: str) -> RefreshToken:
-        await super().validate_token(encoded_token)
-
-        payload = self.get_payload(encoded_token)
+        payload = self._parse_claims(self._decode_token(encoded_token))
 
         if not await self.repo.exist(payload.jti):
             raise RevokedRefreshTokenError
@@ -38,11 +42,22 @@ class RefreshTokenService(BaseTokenService):
         await self.revoked_repo.save(token_jti)
 
     async def revoke_user_tokens(self, user_id: str):
-        deleted_token_ids = await self.repo.delete_by_user_id(user_id=user_id)
-        await self.revoked_repo.bulk_save(deleted_token_ids)
+        """Revoke every token of the user issued until now with a single epoch write, whatever their number."""
+        valid_after = datetime.now(timezone.utc)
+        await self.repo.save_user_epoch(user_id, valid_after)
+        await self.tokens_epoch_repo.save(user_id, valid_after.timestamp())
 
     def get_payload(self, encoded_token: str) -> RefreshToken:
+        return self._parse_claims(jwt.get_unverified_claims(encoded_token))
+
+    def _parse_claims(self, claims: dict[str, Any]) -> RefreshToken:
         try:
-            return RefreshToken(**jwt.get_unverified_claims(encoded_token))
+            return RefreshToken(**claims)
         except ValidationError as e:
             raise InvalidTokenPayloadError from e
+
+
+async def purge_refresh_tokens(batch_size: int = settings.token.refresh_token_purge_batch_size) -> int:
+    """Delete expired and revoked refresh tokens from the database."""
+    async with postgres.async_session() as session:
+        return await SQLAlchemyRefreshTokenRepository(client=session).purge(batch_size)
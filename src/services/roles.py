@@ -1,16 +1,27 @@
-from typing import Annotated
+from typing import Annotated, Any
 
 from fastapi import Depends
+from sqlalchemy.exc import IntegrityError
 
 from db.roles import RoleDatabase, get_role_db
-from models.roles import Role
+from models.roles import Permission, Role
+from repositories.roles.roles_catalog import RolesCatalog, get_roles_catalog
 from schemas.roles import RoleCreate, RoleUpdate
 from services import exceptions
 
 
+def _is_title_conflict(error: IntegrityError) -> bool:
+    # unique_violation of the roles title index, any other violation is not a duplicate role
+    return (
+        getattr(error.orig, "sqlstate", None) == "23505"
+        and getattr(getattr(error.orig, "__cause__", None), "constraint_name", None) == "ix_roles_title"
+    )
+
+
 class RoleManager:
-    def __init__(self, role_db: RoleDatabase):
+    def __init__(self, role_db: RoleDatabase, catalog: RolesCatalog | None = None):
         self.role_db = role_db
+        self.catalog = catalog
 
     async def get_role(self, role_id: str) -> Role:
         """Get role by id in database."""
@@ -22,29 +33,64 @@ class RoleManager:
 
     async def create(self, role_create: RoleCreate) -> Role:
         """Create a role in database."""
-        existing_role = await self.role_db.get_by_title(role_create.title)
-        if existing_role is not None:
-            raise exceptions.RoleAlreadyExistsError()
-        role_dict = role_create.model_dump(exclude_unset=True)
-        created_role = await self.role_db.create(role_dict)
+        await self._check_title(role_create.title)
+        role_dict = self._to_db(role_create.model_dump(exclude_unset=True))
+        try:
+            created_role = await self.role_db.create(role_dict)
+        except IntegrityError as e:
+            # created by another worker after our snapshot was synced
+            if _is_title_conflict(e):
+                raise exceptions.RoleAlreadyExistsError() from e
+            raise
+        await self._on_change()
 
         return created_role
 
     async def update(self, role_update: RoleUpdate, role: Role) -> Role:
         """Create a role in database."""
-        role_dict = role_update.model_dump(exclude_unset=True)
-        updated_role = await self.role_db.update(role, role_dict)
+        role_dict = self._to_db(role_update.model_dump(exclude_unset=True))
+        if "title" in role_dict:
+            await self._check_title(role_dict["title"], role)
+        try:
+            updated_role = await self.role_db.update(role, role_dict)
+        except IntegrityError as e:
+            if _is_title_conflict(e):
+                raise exceptions.RoleAlreadyExistsError() from e
+            raise
+        await self._on_change()
 
         return updated_role
 
     async def delete(self, role: Role) -> None:
         """Delete a role in database."""
         await self.role_db.delete(role)
+        await self._on_change()
 
     async def get_roles(self):
         """Get roles in database."""
         return await self.role_db.all()
 
+    async def _check_title(self, title: str, role: Role | None = None) -> None:
+        if self.catalog is not None:
+            # uniqueness is checked against the current snapshot, not one up to a refresh interval old
+            await self.catalog.sync()
+        existing_role = await self.role_db.get_by_title(title)
+        if existing_role is not None and (role is None or existing_role.id != role.id):
+            raise exceptions.RoleAlreadyExistsError()
+
+    async def _on_change(self) -> None:
+        if self.catalog is not None:
+            await self.catalog.invalidate()
+
+    @staticmethod
+    def _to_db(role_dict: dict[str, Any]) -> dict[str, Any]:
+        if "permissions" in role_dict:
+            role_dict["permissions"] = int(Permission.from_names(role_dict["permissions"]))
+        return role_dict
+
 
-async def get_role_manager(role_db: Annotated[RoleDatabase, Depends(get_role_db)]):
-    yield RoleManager(role_db)
+async def get_role_manager(
+    role_db: Annotated[RoleDatabase, Depends(get_role_db)],
+    catalog: Annotated[RolesCatalog | None, Depends(get_roles_catalog)] = None,
+):
+    yield RoleManager(role_db, catalog)
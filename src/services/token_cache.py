@@ -0,0 +1,49 @@
+import hashlib
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Generic, TypeVar
+
+from entities.tokens import JWTToken
+
+T = TypeVar("T", bound=JWTToken)
+
+
+class VerifiedTokenCache(Generic[T]):
+    """
+    Size-bounded LRU of tokens whose signature was already checked.
+    Keyed by the token digest, an entry is dropped once the token expires.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[bytes, T] = OrderedDict()
+
+    def get(self, encoded_token: str) -> T | None:
+        key = self._key(encoded_token)
+        payload = self._entries.get(key)
+        if payload is None:
+            return None
+
+        if payload.exp <= datetime.now(timezone.utc):
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return payload
+
+    def put(self, encoded_token: str, payload: T) -> None:
+        if self.maxsize <= 0:
+            return
+
+        key = self._key(encoded_token)
+        self._entries[key] = payload
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    @staticmethod
+    def _key(encoded_token: str) -> bytes:
+        return hashlib.sha256(encoded_token.encode()).digest()
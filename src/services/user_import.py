@@ -0,0 +1,160 @@
+import asyncio
+import csv
+import itertools
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Literal
+
+from pydantic import ValidationError
+
+from db import postgres
+from db.users import UserDatabase
+from models.users import User
+from schemas.users import UserImport
+from services.password_hasher import PasswordHasher, is_password_hash
+
+ImportFormat = Literal["csv", "jsonl"]
+ImportMethod = Literal["copy", "insert"]
+
+
+@dataclass
+class BatchReport:
+    number: int
+    rows: int
+    inserted: int
+    hash_seconds: float
+    load_seconds: float
+    elapsed: float
+
+    @property
+    def skipped(self) -> int:
+        return self.rows - self.inserted
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+
+@dataclass
+class ImportReport:
+    rows: int = 0
+    inserted: int = 0
+    # line number and reason of every row that failed validation
+    invalid: list[tuple[int, str]] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def skipped(self) -> int:
+        """Valid rows left out because the id or email already exists."""
+        return self.rows - self.inserted
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+
+def read_rows(path: Path, format: ImportFormat) -> Iterator[tuple[int, dict[str, Any] | str]]:
+    """Stream (line number, row) pairs, CSV rows as dicts and JSONL rows as the raw JSON line."""
+    with path.open(newline="", encoding="utf-8") as file:
+        if format == "csv":
+            reader = csv.DictReader(file)
+            for row in reader:
+                # empty cells fall back to the schema defaults
+                yield reader.line_num, {name: value for name, value in row.items() if value not in ("", None)}
+        else:
+            for line_number, line in enumerate(file, start=1):
+                if line.strip():
+                    yield line_number, line
+
+
+def validate_rows(
+    rows: Iterable[tuple[int, dict[str, Any] | str]], invalid: list[tuple[int, str]]
+) -> Iterator[UserImport]:
+    for line_number, row in rows:
+        try:
+            user = UserImport.model_validate_json(row) if isinstance(row, str) else UserImport.model_validate(row)
+        except ValidationError as e:
+            invalid.append((line_number, "; ".join(error["msg"] for error in e.errors())))
+            continue
+        if user.hashed_password is not None and not is_password_hash(user.hashed_password):
+            invalid.append((line_number, "hashed_password is not a supported password hash"))
+            continue
+        yield user
+
+
+async def prepare_batch(users: list[UserImport], hasher: PasswordHasher) -> tuple[list[dict[str, Any]], float]:
+    """Users table rows of a batch, with plaintext passwords hashed on the hasher's pool."""
+    started = time.perf_counter()
+    hashes = iter(await hasher.hash_many([user.password for user in users if user.password is not None]))
+    hash_seconds = time.perf_counter() - started
+
+    now = datetime.utcnow()
+    rows = [
+        {
+            "id": user.id or uuid.uuid4(),
+            "email": user.email,
+            "hashed_password": next(hashes) if user.password is not None else user.hashed_password,
+            "is_active": user.is_active,
+            "is_superuser": False,
+            "is_verified": user.is_verified,
+            "created_at": now,
+            "updated_at": now,
+            "role": user.role,
+        }
+        for user in users
+    ]
+    return rows, hash_seconds
+
+
+async def import_users(
+    path: Path,
+    format: ImportFormat,
+    hasher: PasswordHasher,
+    batch_size: int = 5000,
+    method: ImportMethod = "copy",
+    on_batch: Callable[[BatchReport], None] | None = None,
+) -> ImportReport:
+    """
+    Load users from a CSV or JSONL file in batches, rows whose id or email already exists are skipped.
+    Rows without an id get a new one. The next batch is read and hashed while the current one is written.
+    """
+    report = ImportReport()
+    started = time.perf_counter()
+    users = validate_rows(read_rows(path, format), report.invalid)
+
+    def next_batch() -> asyncio.Task[tuple[list[dict[str, Any]], float]] | None:
+        batch = list(itertools.islice(users, batch_size))
+        return asyncio.create_task(prepare_batch(batch, hasher)) if batch else None
+
+    pending = next_batch()
+    number = 0
+    try:
+        while pending is not None:
+            batch_started = time.perf_counter()
+            rows, hash_seconds = await pending
+            pending = next_batch()
+
+            load_started = time.perf_counter()
+            async with postgres.async_session() as session:
+                user_db = UserDatabase(session, User)
+                inserted = await (user_db.copy_many(rows) if method == "copy" else user_db.insert_many(rows))
+            now = time.perf_counter()
+
+            number += 1
+            report.rows += len(rows)
+            report.inserted += inserted
+            if on_batch is not None:
+                on_batch(
+                    BatchReport(number, len(rows), inserted, hash_seconds, now - load_started, now - batch_started)
+                )
+    finally:
+        # a failed load leaves the next batch hashing in the background
+        if pending is not None:
+            pending.cancel()
+            await asyncio.gather(pending, return_exceptions=True)
+
+    report.elapsed = time.perf_counter() - started
+    return report
@@ -1,25 +1,32 @@
-from typing import Annotated
+from datetime import datetime, timezone
+from typing import Annotated, AsyncIterator
 from uuid import UUID
 
 from fastapi import Depends, Request
 from passlib import pwd
-from passlib.context import CryptContext
 
+from db import postgres
 from db.users import UserDatabase, get_user_db
+from metrics import time_stage
 from models.users import LoginHistory, User
+from schemas.pagination import Cursor
 from schemas.users import CreateLoginHistory, UserCredentials, UserUpdate
 from services import exceptions
+from services.login_history_writer import LoginHistoryWriter, get_login_history_writer
+from services.password_hasher import PasswordHasher, get_password_hasher
 
 
 class PasswordHelper:
-    def __init__(self):
-        self.context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    def __init__(self, hasher: PasswordHasher | None = None):
+        self.hasher = hasher or get_password_hasher()
 
-    def verify_and_update(self, plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
-        return self.context.verify_and_update(plain_password, hashed_password)
+    async def verify_and_update(self, plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+        with time_stage("bcrypt_verify"):
+            return await self.hasher.verify_and_update(plain_password, hashed_password)
 
-    def hash(self, password: str) -> str:
-        return self.context.hash(password)
+    async def hash(self, password: str) -> str:
+        with time_stage("bcrypt_hash"):
+            return await self.hasher.hash(password)
 
     @staticmethod
     def generate() -> str:
@@ -27,9 +34,10 @@ class PasswordHelper:
 
 
 class UserManager:
-    def __init__(self, user_db: UserDatabase):
+    def __init__(self, user_db: UserDatabase, history_writer: LoginHistoryWriter | None = None):
         self.user_db = user_db
         self.password_helper = PasswordHelper()
+        self.history_writer = history_writer
 
     async def get_user(self, user_id: str) -> User:
         """Get user by id in database."""
@@ -39,11 +47,10 @@ class UserManager:
 
         return user
 
-    async def get_users(self, page_size: int | None, page_number: int | None) -> list[User]:
-        """Get users in database."""
-        return await self.user_db.all(
-            limit=page_size, offset=self._get_offset(page_number=page_number, page_size=page_size)
-        )
+    async def get_users(self, page_size: int, cursor: Cursor | None) -> tuple[list[User], Cursor | None]:
+        """Get a page of users in database and the cursor of the next page."""
+        users = await self.user_db.all(limit=page_size, after=cursor)
+        return users, self._get_next_cursor(users, page_size)
 
     async def create(self, user_create: UserCredentials, is_superuser: bool = False) -> User:
         """Create a user in database."""
@@ -59,7 +66,7 @@ class UserManager:
         user_dict["role"] = user_role
 
         password = user_dict.pop("password")
-        user_dict["hashed_password"] = self.password_helper.hash(password)
+        user_dict["hashed_password"] = await self.password_helper.hash(password)
 
         created_user = await self.user_db.create(user_dict)
 
@@ -86,10 +93,10 @@ class UserManager:
         except exceptions.UserNotExistsError:
             # Run the hasher to mitigate timing attack
             # Inspired from Django: https://code.djangoproject.com/ticket/20760
-            self.password_helper.hash(credentials.password)
+            await self.password_helper.hash(credentials.password)
             return None
 
-        verified, updated_password_hash = self.password_helper.verify_and_update(
+        verified, updated_password_hash = await self.password_helper.verify_and_update(
             credentials.password, user.hashed_password
         )
 
@@ -111,12 +118,11 @@ class UserManager:
         return user
 
     async def get_login_history(
-        self, user_id: UUID, page_size: int | None, page_number: int | None
-    ) -> list[LoginHistory]:
-        """Get user login history."""
-        return await self.user_db.get_login_history(
-            user_id=user_id, limit=page_size, offset=self._get_offset(page_number=page_number, page_size=page_size)
-        )
+        self, user_id: UUID, page_size: int, cursor: Cursor | None
+    ) -> tuple[list[LoginHistory], Cursor | None]:
+        """Get a page of user login history, newest first, and the cursor of the next page."""
+        histories = await self.user_db.get_login_history(user_id=user_id, limit=page_size, before=cursor)
+        return histories, self._get_next_cursor(histories, page_size)
 
     async def on_after_login(self, user: User, request: Request) -> None:
         """Logic after user login."""
@@ -126,15 +132,36 @@ class UserManager:
             referer=request.headers.get("referer", ""),
             remote_addr=request.client.host if request.client else "",
         )
-        await self.user_db.add_login_history(user, history.model_dump())
+        with time_stage("login_history"):
+            if self.history_writer is not None:
+                await self.history_writer.put(history.model_dump())
+            else:
+                await self.user_db.add_login_history(history.model_dump())
 
     @staticmethod
-    def _get_offset(page_number: int | None, page_size: int | None) -> int | None:
-        if page_number is not None and page_size is not None:
-            return (page_number - 1) * page_size
+    def _get_next_cursor(rows: list[User] | list[LoginHistory], page_size: int) -> Cursor | None:
+        if len(rows) < page_size:
+            return None
+
+        last_row = rows[-1]
+        return Cursor(created_at=last_row.created_at, id=last_row.id)
+
 
-        return None
+async def get_user_manager(
+    user_db: Annotated[UserDatabase, Depends(get_user_db)],
+    history_writer: Annotated[LoginHistoryWriter | None, Depends(get_login_history_writer)] = None,
+):
+    yield UserManager(user_db, history_writer)
 
 
-async def get_user_manager(user_db: Annotated[UserDatabase, Depends(get_user_db)]):
-    yield UserManager(user_db)
+async def stream_users(updated_since: datetime | None = None) -> AsyncIterator[list[User]]:
+    """
+    Batches of users for an export, oldest change first.
+    Runs on its own session: a streamed response outlives the request's dependencies.
+    """
+    if updated_since is not None and updated_since.tzinfo is not None:
+        # users timestamps are naive UTC
+        updated_since = updated_since.astimezone(timezone.utc).replace(tzinfo=None)
+    async with postgres.async_session() as session:
+        async for users in UserDatabase(session, User).stream(updated_since):
+            yield users
@@ -1,4 +1,5 @@
 import os
+from typing import Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -26,7 +27,19 @@ class TokenSettings(EnvSettings):
     secret_key: str = Field(default="")
     public_key: str | None = None
     algorithm: str = "RS256"
+    # "cryptography" adds EdDSA, see benchmarks/jwt_signing.py for the cost of each algorithm
+    jwt_engine: Literal["jose", "cryptography"] = "jose"
+    # defaults to the RFC 7638 thumbprint of the public key
+    key_id: str | None = None
+    # PEM public keys still accepted for verification and published in JWKS:
+    # the previous key until its tokens expire and the next one before it starts signing
+    additional_public_keys: list[str] = Field(default_factory=list)
+    jwks_max_age: int = Field(default=60 * 5)
     type: str = "Bearer"
+    verified_token_cache_size: int = Field(default=10_000)
+    refresh_token_purge_batch_size: int = Field(default=1000)
+    refresh_token_purge_interval: int = Field(default=60 * 60)
+    check_access_batch_max_size: int = Field(default=100)
 
 
 class PostgresSettings(EnvSettings):
@@ -35,6 +48,15 @@ class PostgresSettings(EnvSettings):
     db_host: str = Field(default="localhost")
     db_port: int = Field(default=5432)
     db_name: str = Field(default="auth_db")
+    db_pool_size: int = Field(default=10)
+    db_max_overflow: int = Field(default=10)
+    db_pool_timeout: float = Field(default=30.0)
+    # seconds, -1 keeps connections forever
+    db_pool_recycle: int = Field(default=1800)
+    db_pool_pre_ping: bool = False
+    db_pool_warm_up: bool = True
+    # asyncpg server-side statement cache and SQLAlchemy's prepared statement cache, 0 disables (e.g. pgbouncer)
+    db_statement_cache_size: int = Field(default=100)
 
     @property
     def db_url(self) -> str:
@@ -45,11 +67,66 @@ class RedisSettings(EnvSettings):
     redis_host: str = Field(default="127.0.0.1")
     redis_port: int = Field(default=6379)
     cache_expire_in_seconds: int = Field(default=(60 * 5))
+    revocation_cache_enabled: bool = True
+
+
+class HashingSettings(EnvSettings):
+    hashing_executor: Literal["process", "thread"] = "process"
+    hashing_workers: int | None = None
+    hashing_max_pending: int = Field(default=64)
+    # jobs waiting for the pool beyond this are rejected with 503, unset waits without bound
+    hashing_max_queued: int | None = Field(default=1024)
+
+
+class LoginHistorySettings(EnvSettings):
+    login_history_batch_size: int = Field(default=500)
+    login_history_flush_interval: float = Field(default=1.0)
+    login_history_queue_size: int = Field(default=10_000)
+    # a batch that fails to write is retried with exponential backoff before it is dropped
+    login_history_max_retries: int = Field(default=5)
+    login_history_retry_interval: float = Field(default=1.0)
+    login_history_partitions_ahead: int = Field(default=3)
+    # months of history to keep, 0 keeps everything
+    login_history_retention_months: int = Field(default=0)
+    login_history_maintenance_interval: int = Field(default=60 * 60)
 
 
 class ApiSettings(EnvSettings):
-    default_page_number: int = 1
     default_page_size: int = 50
+    # build the request user from access token claims instead of loading it from postgres
+    stateless_principal: bool = False
+    # seconds between checks of the roles version, role edits reach the snapshot
+    # and permission matrix of the other workers within it
+    roles_sync_interval: float = Field(default=5.0)
+
+
+class AdmissionSettings(EnvSettings):
+    # login, register and refresh per worker, cheap routes are not limited
+    admission_control_enabled: bool = True
+    admission_max_in_flight: int = Field(default=16)
+    # seconds a request may wait for a slot before it is shed with 503
+    admission_queue_timeout: float = Field(default=2.0)
+    admission_max_queued: int = Field(default=256)
+    admission_retry_after: int = Field(default=1)
+
+
+class RateLimitSettings(EnvSettings):
+    # attempts per window, checked before any password hashing
+    rate_limit_enabled: bool = True
+    rate_limit_window: int = Field(default=60)
+    login_rate_limit_per_ip: int = Field(default=60)
+    login_rate_limit_per_email: int = Field(default=20)
+    register_rate_limit_per_ip: int = Field(default=20)
+
+
+class TracingSettings(EnvSettings):
+    tracing_exporter: Literal["none", "console", "file", "otlp"] = "none"
+    tracing_file: str = "traces.jsonl"
+    # e.g. http://otel-collector:4318/v1/traces, defaults to OTEL_EXPORTER_OTLP_* variables
+    tracing_otlp_endpoint: str | None = None
+    tracing_service_name: str = "auth_service"
+    # share of traces started here that are recorded, incoming traceparent sampling decisions are kept
+    tracing_sample_ratio: float = Field(default=1.0, ge=0, le=1)
 
 
 class Settings(BaseSettings):
@@ -58,6 +135,11 @@ class Settings(BaseSettings):
     redis: RedisSettings = RedisSettings()
     token: TokenSettings = TokenSettings()
     api: ApiSettings = ApiSettings()
+    hashing: HashingSettings = HashingSettings()
+    login_history: LoginHistorySettings = LoginHistorySettings()
+    admission: AdmissionSettings = AdmissionSettings()
+    rate_limit: RateLimitSettings = RateLimitSettings()
+    tracing: TracingSettings = TracingSettings()
 
 
 settings = Settings()
@@ -0,0 +1,120 @@
+import functools
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from opentelemetry import propagate, trace
+from opentelemetry.sdk.resources import SERVICE_NAME, Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter, SpanExporter
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from metrics import route_template
+from settings import TracingSettings
+
+# a no-op tracer until `configure_tracing` installs a provider
+tracer = trace.get_tracer("auth_service")
+
+T = TypeVar("T")
+
+
+def traced(
+    name: str | None = None, kind: SpanKind = SpanKind.INTERNAL, attributes: dict[str, Any] | None = None
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """Runs a coroutine function inside a span named after its qualified name by default."""
+
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            with tracer.start_as_current_span(span_name, kind=kind, attributes=attributes):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def traced_query(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    return traced(kind=SpanKind.CLIENT, attributes={"db.system": "postgresql"})(func)
+
+
+def redis_span(operation: str, keys: int = 1):
+    """`with redis_span("MGET", keys=len(keys)): ...` around a command or a pipeline round trip."""
+    return tracer.start_as_current_span(
+        f"redis {operation}",
+        kind=SpanKind.CLIENT,
+        attributes={"db.system": "redis", "db.operation": operation, "db.redis.key_count": keys},
+    )
+
+
+class TracingMiddleware:
+    """Server span per request, continuing the trace of an incoming `traceparent` header."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        carrier = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope["headers"]}
+        with tracer.start_as_current_span(
+            scope["method"],
+            context=propagate.extract(carrier),
+            kind=SpanKind.SERVER,
+            attributes={"http.request.method": scope["method"], "url.path": scope["path"]},
+        ) as span:
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.response.status_code", message["status"])
+                    if message["status"] >= 500:
+                        span.set_status(Status(StatusCode.ERROR))
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = route_template(scope)
+                span.update_name(f"{scope['method']} {route}")
+                span.set_attribute("http.route", route)
+
+
+class FileSpanExporter(ConsoleSpanExporter):
+    """Appends spans to a file as JSON lines, the file is closed when the provider shuts down."""
+
+    def __init__(self, path: str):
+        self._file = open(path, "a")
+        super().__init__(out=self._file, formatter=lambda span: span.to_json(indent=None) + "\n")
+
+    def shutdown(self) -> None:
+        super().shutdown()
+        self._file.close()
+
+
+def _create_exporter(tracing_settings: TracingSettings) -> SpanExporter:
+    if tracing_settings.tracing_exporter == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+        # OTEL_EXPORTER_OTLP_* environment variables apply when the endpoint is not set
+        return OTLPSpanExporter(endpoint=tracing_settings.tracing_otlp_endpoint)
+    if tracing_settings.tracing_exporter == "file":
+        return FileSpanExporter(tracing_settings.tracing_file)
+    return ConsoleSpanExporter()
+
+
+def configure_tracing(tracing_settings: TracingSettings) -> Optional[TracerProvider]:
+    if tracing_settings.tracing_exporter == "none":
+        return None
+
+    provider = TracerProvider(
+        resource=Resource.create({SERVICE_NAME: tracing_settings.tracing_service_name}),
+        sampler=ParentBased(TraceIdRatioBased(tracing_settings.tracing_sample_ratio)),
+    )
+    # spans are exported from a background thread, off the request path
+    provider.add_span_processor(BatchSpanProcessor(_create_exporter(tracing_settings)))
+    trace.set_tracer_provider(provider)
+    return provider
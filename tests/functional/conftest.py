@@ -1,7 +1,9 @@
 pytest_plugins = (
     "functional.src.fixtures.asyncio",
     "functional.src.fixtures.aiohttp",
+    "functional.src.fixtures.redis",
     "functional.src.fixtures.postgres",
     "functional.src.fixtures.auth",
     "functional.src.fixtures.users",
+    "functional.src.fixtures.roles",
 )
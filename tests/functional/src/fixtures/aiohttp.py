@@ -30,3 +30,57 @@ def make_get_request():
         return body, cookies, status
 
     return inner
+
+
+@pytest_asyncio.fixture(name="make_patch_request")
+def make_patch_request():
+    async def inner(url: str, body_data: dict[str, Any] | None = None, cookies: dict | None = None) -> Any:
+        async with aiohttp.ClientSession() as session:
+            async with session.patch(url, json=body_data, cookies=cookies) as response:
+                body = await response.json()
+                cookies = response.cookies
+                status = response.status
+
+        return body, cookies, status
+
+    return inner
+
+
+@pytest_asyncio.fixture(name="make_delete_request")
+def make_delete_request():
+    async def inner(url: str, cookies: dict | None = None) -> Any:
+        async with aiohttp.ClientSession() as session:
+            async with session.delete(url, cookies=cookies) as response:
+                status = response.status
+
+        return status
+
+    return inner
+
+
+@pytest_asyncio.fixture(name="make_get_page_request")
+def make_get_page_request():
+    async def inner(url: str, params: dict[str, Any] | None = None, cookies: dict | None = None) -> Any:
+        async with aiohttp.ClientSession() as session:
+            async with session.get(url, params=params, cookies=cookies) as response:
+                body = await response.json()
+                headers = response.headers
+                status = response.status
+
+        return body, headers, status
+
+    return inner
+
+
+@pytest_asyncio.fixture(name="make_get_text_request")
+def make_get_text_request():
+    async def inner(url: str, params: dict[str, Any] | None = None, cookies: dict | None = None) -> Any:
+        async with aiohttp.ClientSession() as session:
+            async with session.get(url, params=params, cookies=cookies) as response:
+                text = await response.text()
+                headers = response.headers
+                status = response.status
+
+        return text, headers, status
+
+    return inner
@@ -61,3 +61,13 @@ async def make_check_access(make_post_request):
         return body, cookies, status
 
     return inner
+
+
+@pytest_asyncio.fixture(name="make_check_access_batch")
+async def make_check_access_batch(make_post_request):
+    async def inner(access_tokens: list[str]):
+        url = test_settings.service_url + "/api/v1/auth/check_access/batch"
+        body, cookies, status = await make_post_request(url, body_data={"access_tokens": access_tokens})
+        return body, cookies, status
+
+    return inner
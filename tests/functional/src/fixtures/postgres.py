@@ -2,6 +2,7 @@ import psycopg2
 import pytest_asyncio
 
 from ...settings import test_settings
+from .redis import delete_keys
 
 
 @pytest_asyncio.fixture
@@ -9,3 +10,16 @@ def clear_db():
     with psycopg2.connect(test_settings.db_dsn) as conn:
         with conn.cursor() as cur:
             cur.execute("TRUNCATE login_histories, users, refresh_tokens CASCADE")
+    # truncated users must not be served from the cache, and every test starts with fresh rate limit windows
+    delete_keys("user_*", "rate_limit_*")
+
+
+@pytest_asyncio.fixture(name="make_superuser")
+def make_superuser():
+    def inner(email: str):
+        # the API has no way to grant superuser, the CLI does the same update
+        with psycopg2.connect(test_settings.db_dsn) as conn:
+            with conn.cursor() as cur:
+                cur.execute("UPDATE users SET role = 'superuser', is_superuser = true WHERE email = %s", (email,))
+
+    return inner
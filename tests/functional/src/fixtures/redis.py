@@ -0,0 +1,21 @@
+import pytest_asyncio
+from redis import Redis
+
+from ...settings import test_settings
+
+
+def delete_keys(*patterns: str) -> None:
+    redis_client = Redis(host=test_settings.redis_host, port=test_settings.redis_port)
+    for pattern in patterns:
+        keys = list(redis_client.scan_iter(match=pattern))
+        if keys:
+            redis_client.delete(*keys)
+
+
+@pytest_asyncio.fixture(name="clear_user_cache")
+def clear_user_cache():
+    def inner():
+        # users are cached in Redis by id and email
+        delete_keys("user_*")
+
+    return inner
@@ -0,0 +1,46 @@
+import pytest_asyncio
+
+from ...settings import test_settings
+
+
+@pytest_asyncio.fixture(name="create_role")
+async def create_role(make_post_request):
+    async def inner(access_token: str, role_data: dict):
+        url = test_settings.service_url + "/api/v1/roles/"
+        body, cookies, status = await make_post_request(
+            url, body_data=role_data, cookies={"access_token": access_token}
+        )
+        return body, cookies, status
+
+    return inner
+
+
+@pytest_asyncio.fixture(name="get_roles")
+async def get_roles(make_get_request):
+    async def inner(access_token: str):
+        url = test_settings.service_url + "/api/v1/roles/"
+        body, cookies, status = await make_get_request(url, cookies={"access_token": access_token})
+        return body, cookies, status
+
+    return inner
+
+
+@pytest_asyncio.fixture(name="update_role")
+async def update_role(make_patch_request):
+    async def inner(access_token: str, role_id: str, role_data: dict):
+        url = test_settings.service_url + f"/api/v1/roles/{role_id}"
+        body, cookies, status = await make_patch_request(
+            url, body_data=role_data, cookies={"access_token": access_token}
+        )
+        return body, cookies, status
+
+    return inner
+
+
+@pytest_asyncio.fixture(name="delete_role")
+async def delete_role(make_delete_request):
+    async def inner(access_token: str, role_id: str):
+        url = test_settings.service_url + f"/api/v1/roles/{role_id}"
+        return await make_delete_request(url, cookies={"access_token": access_token})
+
+    return inner
@@ -1,3 +1,5 @@
+import json
+
 import pytest_asyncio
 
 from ...settings import test_settings
@@ -21,3 +23,50 @@ async def get_login_history(make_get_request):
         return body, cookies, status
 
     return inner
+
+
+@pytest_asyncio.fixture(name="get_users")
+async def get_users(make_get_request):
+    async def inner(access_token: str):
+        url = test_settings.service_url + "/api/v1/users/"
+        body, cookies, status = await make_get_request(url, cookies={"access_token": access_token})
+        return body, cookies, status
+
+    return inner
+
+
+@pytest_asyncio.fixture(name="update_user")
+async def update_user(make_patch_request):
+    async def inner(access_token: str, user_id: str, user_data: dict):
+        url = test_settings.service_url + f"/api/v1/users/{user_id}"
+        body, cookies, status = await make_patch_request(
+            url, body_data=user_data, cookies={"access_token": access_token}
+        )
+        return body, cookies, status
+
+    return inner
+
+
+@pytest_asyncio.fixture(name="get_page")
+async def get_page(make_get_page_request):
+    async def inner(path: str, access_token: str, page_size: int, cursor: str | None = None):
+        url = test_settings.service_url + path
+        params: dict = {"page_size": page_size}
+        if cursor is not None:
+            params["cursor"] = cursor
+        body, headers, status = await make_get_page_request(url, params=params, cookies={"access_token": access_token})
+        return body, headers.get("X-Next-Cursor"), status
+
+    return inner
+
+
+@pytest_asyncio.fixture(name="export_users")
+async def export_users(make_get_text_request):
+    async def inner(access_token: str, updated_since: str | None = None):
+        url = test_settings.service_url + "/api/v1/users/export"
+        params = {"updated_since": updated_since} if updated_since is not None else None
+        text, headers, status = await make_get_text_request(url, params=params, cookies={"access_token": access_token})
+        users = [json.loads(line) for line in text.splitlines()] if status == 200 else []
+        return users, headers, status
+
+    return inner
@@ -79,3 +79,50 @@ async def test_logout_all_flow(make_register, make_login, make_logout_all, make_
     body, _, status = await make_check_access(access_tokens[1])
     assert status == HTTPStatus.FORBIDDEN
     assert body.get("detail") == "REVOKED_ACCESS_TOKEN"
+
+
+@pytest.mark.asyncio
+async def test_check_access_batch_flow(make_register, make_login, make_logout, make_check_access_batch, clear_db):
+    user_email = "test@test.com"
+    user_password = "password"
+
+    body, _, _ = await make_register(user_email, user_password)
+    user_id = body["id"]
+
+    access_tokens = []
+    for _ in range(2):
+        body, _, _ = await make_login(user_email, user_password)
+        access_tokens.append(body.get("access_token"))
+
+    await make_logout(access_tokens[1])
+
+    # header {"alg":"HS256","kid":["x"]}: a kid that is not a string
+    bad_kid = "eyJhbGciOiJIUzI1NiIsImtpZCI6WyJ4Il19.e30.c2ln"
+    body, _, status = await make_check_access_batch([*access_tokens, "invalid", bad_kid])
+    assert status == HTTPStatus.OK
+
+    valid, revoked, invalid, forged = body["results"]
+    assert valid["valid"] is True
+    assert valid["claims"]["sub"] == user_id
+    assert revoked["valid"] is False
+    assert revoked["error"] == "REVOKED_ACCESS_TOKEN"
+    assert invalid["valid"] is False
+    assert invalid["error"] == "INVALID_TOKEN_SIGNATURE"
+    assert forged["valid"] is False
+    assert forged["error"] == "INVALID_TOKEN_SIGNATURE"
+
+
+@pytest.mark.asyncio
+async def test_login_rate_limit_flow(make_login):
+    user_email = "rate-limited@test.com"
+    user_password = "wrong-password"
+
+    statuses = []
+    for _ in range(100):
+        body, _, status = await make_login(user_email, user_password)
+        statuses.append(status)
+        if status == HTTPStatus.TOO_MANY_REQUESTS:
+            break
+
+    assert statuses[-1] == HTTPStatus.TOO_MANY_REQUESTS
+    assert body.get("detail") == "TOO_MANY_REQUESTS"
@@ -0,0 +1,66 @@
+import asyncio
+import uuid
+from http import HTTPStatus
+
+import pytest
+
+
+async def wait_for_status(request, expected: HTTPStatus):
+    # role changes reach the other workers within ROLES_SYNC_INTERVAL
+    status = None
+    for _ in range(20):
+        _, _, status = await request()
+        if status == expected:
+            break
+        await asyncio.sleep(0.5)
+    return status
+
+
+@pytest.mark.asyncio
+async def test_role_permissions_flow(
+    make_register,
+    make_login,
+    make_superuser,
+    get_users,
+    update_user,
+    create_role,
+    get_roles,
+    update_role,
+    delete_role,
+    clear_db,
+):
+    password = "password"
+    await make_register("admin@test.com", password)
+    make_superuser("admin@test.com")
+    body, _, _ = await make_login("admin@test.com", password)
+    admin_token = body["access_token"]
+
+    role_title = f"viewer-{uuid.uuid4().hex[:8]}"
+    body, _, status = await create_role(admin_token, {"title": role_title, "permissions": ["USERS_READ"]})
+    assert status == HTTPStatus.CREATED
+    role_id = body["id"]
+
+    body, _, _ = await make_register("viewer@test.com", password)
+    _, _, status = await update_user(admin_token, body["id"], {"email": "viewer@test.com", "role": role_title})
+    assert status == HTTPStatus.OK
+    body, _, _ = await make_login("viewer@test.com", password)
+    viewer_token = body["access_token"]
+
+    # granted permission
+    _, _, status = await get_users(viewer_token)
+    assert status == HTTPStatus.OK
+    # permission the role does not have
+    body, _, status = await get_roles(viewer_token)
+    assert status == HTTPStatus.FORBIDDEN
+
+    # revoking bumps the roles version, the perm claim of the existing token stops counting
+    _, _, status = await update_role(admin_token, role_id, {"title": role_title, "permissions": []})
+    assert status == HTTPStatus.OK
+    assert await wait_for_status(lambda: get_users(viewer_token), HTTPStatus.FORBIDDEN) == HTTPStatus.FORBIDDEN
+
+    # titles are case-insensitive, a rename that only changes case keeps the role's users
+    _, _, status = await update_role(admin_token, role_id, {"title": role_title.upper(), "permissions": ["USERS_READ"]})
+    assert status == HTTPStatus.OK
+    assert await wait_for_status(lambda: get_users(viewer_token), HTTPStatus.OK) == HTTPStatus.OK
+
+    assert await delete_role(admin_token, role_id) == HTTPStatus.NO_CONTENT
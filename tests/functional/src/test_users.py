@@ -1,3 +1,9 @@
+import asyncio
+import base64
+import json
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+
 import pytest
 
 
@@ -27,5 +33,133 @@ async def test_users_login_history(make_register, make_login, get_login_history,
         body, _, _ = await make_login(user_email, user_password)
         access_token = body["access_token"]
 
-    body, _, _ = await get_login_history(access_token)
+    # history is written in batches in the background, give the writer time to flush
+    for _ in range(10):
+        body, _, _ = await get_login_history(access_token)
+        if len(body) == login_count:
+            break
+        await asyncio.sleep(0.5)
+
     assert len(body) == login_count
+
+
+@pytest.mark.asyncio
+async def test_update_own_user_after_cache_expiry(
+    make_register, make_login, make_superuser, update_user, clear_user_cache, clear_db
+):
+    user_email = "admin@test.com"
+    user_password = "password"
+
+    body, _, _ = await make_register(user_email, user_password)
+    user_id = body["id"]
+    make_superuser(user_email)
+    body, _, _ = await make_login(user_email, user_password)
+    access_token = body["access_token"]
+
+    # the current user is loaded from the database and the patched one from the cache it has just filled
+    clear_user_cache()
+    body, _, status = await update_user(access_token, user_id, {"email": user_email, "role": "superuser"})
+
+    assert status == HTTPStatus.OK
+    assert body["id"] == user_id
+
+
+async def read_pages(get_page, path: str, access_token: str, page_size: int) -> list[list[dict]]:
+    pages, cursor = [], None
+    while True:
+        body, cursor, status = await get_page(path, access_token, page_size, cursor)
+        assert status == HTTPStatus.OK
+        pages.append(body)
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.asyncio
+async def test_users_pagination(make_register, make_login, make_superuser, get_page, clear_db):
+    user_password = "password"
+    emails = [f"user{number}@test.com" for number in range(5)]
+    for email in emails:
+        await make_register(email, user_password)
+    make_superuser(emails[0])
+    body, _, _ = await make_login(emails[0], user_password)
+    access_token = body["access_token"]
+
+    pages = await read_pages(get_page, "/api/v1/users/", access_token, page_size=2)
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert [user["email"] for page in pages for user in page] == emails
+
+    # a cursor carrying a UTC offset points at the same row
+    _, cursor, _ = await get_page("/api/v1/users/", access_token, 2)
+    position = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    created_at = datetime.fromisoformat(position["created_at"]).replace(tzinfo=timezone.utc)
+    position["created_at"] = created_at.astimezone(timezone(timedelta(hours=3))).isoformat()
+    aware_cursor = base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+    body, _, status = await get_page("/api/v1/users/", access_token, 2, aware_cursor)
+    assert status == HTTPStatus.OK
+    assert body == pages[1]
+
+    _, _, status = await get_page("/api/v1/users/", access_token, 2, "not-a-cursor")
+    assert status == HTTPStatus.BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_login_history_pagination(make_register, make_login, get_page, clear_db):
+    user_email = "test@test.com"
+    user_password = "password"
+
+    await make_register(user_email, user_password)
+    login_count = 3
+    access_token = ""
+    for _ in range(login_count):
+        body, _, _ = await make_login(user_email, user_password)
+        access_token = body["access_token"]
+
+    # history is written in batches in the background, give the writer time to flush
+    for _ in range(10):
+        pages = await read_pages(get_page, "/api/v1/users/me/history", access_token, page_size=2)
+        if sum(len(page) for page in pages) == login_count:
+            break
+        await asyncio.sleep(0.5)
+
+    assert [len(page) for page in pages] == [2, 1]
+    created = [history["login_date"] for page in pages for history in page]
+    assert created == sorted(created, reverse=True)
+
+
+@pytest.mark.asyncio
+async def test_users_export(make_register, make_login, make_superuser, update_user, export_users, clear_db):
+    user_password = "password"
+    emails = [f"user{number}@test.com" for number in range(4)]
+    for email in emails:
+        await make_register(email, user_password)
+    make_superuser(emails[0])
+    body, _, _ = await make_login(emails[0], user_password)
+    admin_token = body["access_token"]
+
+    users, headers, status = await export_users(admin_token)
+    assert status == HTTPStatus.OK
+    assert headers["Content-Type"].startswith("application/x-ndjson")
+    assert sorted(user["email"] for user in users) == sorted(emails)
+    assert [(user["updated_at"], user["id"]) for user in users] == sorted(
+        (user["updated_at"], user["id"]) for user in users
+    )
+
+    # an update moves the user to the end of the export
+    changed = next(user for user in users if user["email"] == emails[1])
+    _, _, status = await update_user(
+        admin_token, changed["id"], {"email": emails[1], "role": changed["role"], "is_verified": True}
+    )
+    assert status == HTTPStatus.OK
+    users, _, _ = await export_users(admin_token)
+    assert users[-1]["id"] == changed["id"]
+
+    # the same moment with a UTC offset selects the same users
+    updated_at = datetime.fromisoformat(users[-1]["updated_at"]).replace(tzinfo=timezone.utc)
+    updated_since = updated_at.astimezone(timezone(timedelta(hours=3))).isoformat()
+    users, _, status = await export_users(admin_token, updated_since)
+    assert status == HTTPStatus.OK
+    assert [user["id"] for user in users] == [changed["id"]]
+
+    body, _, _ = await make_login(emails[2], user_password)
+    _, _, status = await export_users(body["access_token"])
+    assert status == HTTPStatus.FORBIDDEN